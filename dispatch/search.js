@@ -0,0 +1,77 @@
+// dispatch/search.js
+// Client for the prebuilt index written by python/dispatch/search.py.
+// Fetches search/meta.json once, then one shard per distinct term prefix.
+//
+//   import { search } from './search.js';
+//   const hits = await search('rust belt');   // [{ url, title, score }, ...]
+
+const STOPWORDS = new Set(`a an and are as at be but by for from has have he her his i in is it its of on or
+our so that the their them they this to was we were what when which who will with
+you your not no do does did than then there these those into out up if just can`.split(/\s+/));
+
+const cache = new Map();
+let metaPromise = null;
+
+function tokenize(text) {
+  return (text.toLowerCase().match(/[a-z0-9]+/g) || []).filter(w => w.length > 1 && !STOPWORDS.has(w));
+}
+
+function readVarint(buf, pos) {
+  let n = 0, shift = 0, b;
+  do {
+    b = buf[pos++];
+    n += (b & 0x7f) * 2 ** shift;
+    shift += 7;
+  } while (b & 0x80);
+  return [n, pos];
+}
+
+function loadShard(base, prefix) {
+  if (!cache.has(prefix)) {
+    cache.set(prefix, fetch(`${base}${prefix}.bin`)
+      .then(r => (r.ok ? r.arrayBuffer() : new ArrayBuffer(0)))
+      .then(b => new Uint8Array(b)));
+  }
+  return cache.get(prefix);
+}
+
+function postings(buf, term) {
+  const dec = new TextDecoder();
+  let pos = 0;
+  while (pos < buf.length) {
+    let len, df;
+    [len, pos] = readVarint(buf, pos);
+    const t = dec.decode(buf.subarray(pos, pos + len));
+    pos += len;
+    [df, pos] = readVarint(buf, pos);
+    const hits = [];
+    let doc = 0;
+    for (let i = 0; i < df; i++) {
+      let gap, w;
+      [gap, pos] = readVarint(buf, pos);
+      [w, pos] = readVarint(buf, pos);
+      doc += gap;
+      if (t === term) hits.push([doc, w]);
+    }
+    if (t === term) return hits;
+    if (t > term) break;
+  }
+  return [];
+}
+
+export async function search(query, base = 'search/', limit = 20) {
+  metaPromise = metaPromise || fetch(`${base}meta.json`).then(r => r.json());
+  const meta = await metaPromise;
+  const terms = [...new Set(tokenize(query))];
+  const scores = new Map();
+  await Promise.all(terms.map(async term => {
+    const buf = await loadShard(base, term.slice(0, meta.prefixLen));
+    for (const [doc, w] of postings(buf, term)) {
+      scores.set(doc, (scores.get(doc) || 0) + w / meta.scale);
+    }
+  }));
+  return [...scores.entries()]
+    .sort((a, b) => b[1] - a[1])
+    .slice(0, limit)
+    .map(([doc, score]) => ({ url: meta.docs[doc][0], title: meta.docs[doc][1], score }));
+}
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Vectorized DCF math shared by the page renderer and Python-side screening.
+
+This is the NumPy twin of the `dcf()` function embedded in render_dcf_html's
+page script: project FCF for N years at growth g, discount at r, Gordon-growth
+terminal value at g_term, subtract net debt and divide by shares. Rates are in
+percent, as on the page. Cells where r <= g_term have no valid value and are NaN.
+
+Usage:
+  # print the sensitivity row for one bundle at the page defaults
+  python dcf_engine.py ../tickers/AAPL/AAPL.json --growth 5 --terminal-growth 2.5
+"""
+import base64
+import json
+from pathlib import Path
+
+import numpy as np
+
+YEARS = 5
+# Same axis the page charts: 4% .. 20% in 0.25 steps (65 rates).
+DISCOUNT_RATES = np.round(np.arange(4.0, 20.0 + 1e-9, 0.25), 2)
+GROWTHS = np.arange(0.0, 10.0 + 1e-9, 1.0)
+TERMINAL_GROWTHS = np.array([1.5, 2.0, 2.5, 3.0, 3.5])
+
+
+def _ivps(fcf0, net_debt, shares, r, g, gt, years):
+    """Core formula; every argument broadcasts. Rates here are fractions, not percent."""
+    # PV of the explicit years: fcf0 * sum_{t=1..N} ((1+g)/(1+r))^t
+    q = (1 + g) / (1 + r)
+    t = np.arange(1, years + 1, dtype=np.float64)
+    pv_cashflows = fcf0 * (np.asarray(q)[..., None] ** t).sum(axis=-1)
+
+    fcf_n = fcf0 * (1 + g) ** years
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terminal = fcf_n * (1 + gt) / (r - gt)
+        pv_terminal = terminal / (1 + r) ** years
+        ivps = (pv_cashflows + pv_terminal - net_debt) / shares
+    return np.where(r > gt, ivps, np.nan)
+
+
+def ivps_grid(fcf0, net_debt, shares, years=YEARS, discount=DISCOUNT_RATES,
+              growth=GROWTHS, terminal_growth=TERMINAL_GROWTHS) -> np.ndarray:
+    """Intrinsic value per share over terminal_growth × growth × discount.
+
+    Returns an array of shape (len(terminal_growth), len(growth), len(discount)).
+    """
+    r = np.asarray(discount, dtype=np.float64)[None, None, :] / 100
+    g = np.asarray(growth, dtype=np.float64)[None, :, None] / 100
+    gt = np.asarray(terminal_growth, dtype=np.float64)[:, None, None] / 100
+    return _ivps(fcf0, net_debt, shares, r, g, gt, years)
+
+
+def intrinsic_values(fcf0, net_debt, shares, discount, growth, terminal_growth, years=YEARS) -> np.ndarray:
+    """Value per share for every (ticker × scenario) pair in one call.
+
+    fcf0/net_debt/shares are length-T arrays (one entry per ticker); discount,
+    growth and terminal_growth are length-S arrays describing S scenarios.
+    Returns shape (T, S).
+    """
+    col = lambda a: np.asarray(a, dtype=np.float64)[:, None]
+    row = lambda a: np.asarray(a, dtype=np.float64)[None, :] / 100
+    return _ivps(col(fcf0), col(net_debt), col(shares), row(discount), row(growth), row(terminal_growth), years)
+
+
+def load_bundles(root: Path = Path("../tickers")):
+    """Read every tickers/<T>/<T>.json bundle into parallel arrays.
+
+    Bundles missing fcf0 or shares are skipped; a missing net_debt counts as 0,
+    matching what render_dcf_html pre-fills.
+    Returns (tickers, fcf0, net_debt, shares).
+    """
+    tickers, fcf0, net_debt, shares = [], [], [], []
+    for path in sorted(Path(root).glob("*/*.json")):
+        if path.stem != path.parent.name:
+            continue
+        try:
+            bundle = json.loads(path.read_text())
+        except Exception:
+            continue
+        d = bundle.get("derived") or {}
+        if d.get("fcf0") is None or not d.get("shares"):
+            continue
+        tickers.append(bundle.get("ticker") or path.stem)
+        fcf0.append(d["fcf0"])
+        net_debt.append(d.get("net_debt") or 0.0)
+        shares.append(d["shares"])
+    return tickers, np.array(fcf0, dtype=np.float64), np.array(net_debt, dtype=np.float64), np.array(shares, dtype=np.float64)
+
+
+def encode_grid(values: np.ndarray) -> str:
+    """Little-endian float32 bytes, base64 encoded, for a JS Float32Array."""
+    return base64.b64encode(np.ascontiguousarray(values, dtype="<f4").tobytes()).decode("ascii")
+
+
+def grid_payload(fcf0, net_debt, shares, years=YEARS) -> dict:
+    """Everything the page needs to chart and look up the precomputed surface."""
+    return {
+        "fcf0": fcf0,
+        "netDebt": net_debt,
+        "shares": shares,
+        "years": years,
+        "discount": DISCOUNT_RATES.tolist(),
+        "growth": GROWTHS.tolist(),
+        "terminalGrowth": TERMINAL_GROWTHS.tolist(),
+        "data": encode_grid(ivps_grid(fcf0, net_debt, shares, years)),
+    }
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Print a DCF sensitivity row (value/share vs discount rate) for one bundle.")
+    ap.add_argument("bundle", help="Path to a dcf_metrics bundle, e.g. ../tickers/AAPL/AAPL.json")
+    ap.add_argument("--years", type=int, default=YEARS)
+    ap.add_argument("--growth", type=float, default=5.0, help="FCF growth, %%")
+    ap.add_argument("--terminal-growth", type=float, default=2.5, help="Terminal growth, %%")
+    args = ap.parse_args()
+
+    derived = json.loads(Path(args.bundle).read_text()).get("derived") or {}
+    row = ivps_grid(derived.get("fcf0") or 0, derived.get("net_debt") or 0, derived.get("shares") or 1,
+                    years=args.years, growth=[args.growth], terminal_growth=[args.terminal_growth])[0, 0]
+    for r, v in zip(DISCOUNT_RATES, row):
+        print(f"{r:6.2f}%\t{v:.2f}")
+
+
+if __name__ == "__main__":
+    main()
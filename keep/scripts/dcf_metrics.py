@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
-import sys, json, time, re
+import json, time, re
 from pathlib import Path
 from typing import Optional, Union
 import requests
+import facts_store
+from python.common import fileio
 
 UA = "Your Name YourSite your.email@example.com"
 
@@ -19,7 +21,7 @@ def load_ticker_map(cache_path: Path) -> dict:
         return json.loads(cache_path.read_text())
     time.sleep(0.2)
     data = http_get(TICKERS_URL).json()
-    cache_path.write_text(json.dumps(data))
+    fileio.write_json(cache_path, data, compact=True)
     return data
 
 def ticker_to_cik(ticker: str, mapping: dict) -> str:
@@ -52,7 +54,7 @@ def latest_filing_accessions(subs_json: dict) -> dict:
     return latest
 
 # --- Batch precompute and index support ---
-def build_bundle(ticker: str, mapping: dict, out_root: Path) -> Path:
+def build_bundle(ticker: str, mapping: dict, out_root: Path, store=None) -> Path:
     ticker = ticker.upper().lstrip("$")
     out_root.mkdir(exist_ok=True)
     out_dir = out_root / ticker
@@ -62,6 +64,8 @@ def build_bundle(ticker: str, mapping: dict, out_root: Path) -> Path:
 
     subs = get_submissions(cik)
     facts = get_company_facts(cik)
+    if store is not None:
+        facts_store.upsert_companyfacts(store, ticker, cik, facts)
 
     latest = latest_filing_accessions(subs)
     latest_10k = latest.get("10-K")
@@ -119,17 +123,18 @@ def build_bundle(ticker: str, mapping: dict, out_root: Path) -> Path:
     }
 
     out_path = out_dir / f"{ticker}.json"
-    out_path.write_text(json.dumps(bundle, indent=2))
+    fileio.write_json(out_path, bundle)
     return out_path
 
-def batch_precompute(tickers, out_root: Path):
-    cache_dir = Path("../db"); cache_dir.mkdir(exist_ok=True)
+def batch_precompute(tickers, out_root: Path, store_path: Optional[Path] = facts_store.DEFAULT_DB):
+    cache_dir = Path("../db")
     mapping = load_ticker_map(cache_dir / "company_tickers.json")
+    store = facts_store.connect(store_path) if store_path else None
 
     index = []
     for t in tickers:
         try:
-            p = build_bundle(t, mapping, out_root)
+            p = build_bundle(t, mapping, out_root, store=store)
             bundle = json.loads(p.read_text())
             index.append({
                 "ticker": bundle.get("ticker"),
@@ -143,7 +148,7 @@ def batch_precompute(tickers, out_root: Path):
             print(f"FAIL {t}: {e}")
 
     idx_path = out_root / "tickers.json"
-    idx_path.write_text(json.dumps(index, indent=2))
+    fileio.write_json(idx_path, index)
     print(f"Wrote index: {idx_path.resolve()}")
     return idx_path
 
@@ -153,20 +158,25 @@ def main():
     ap.add_argument("ticker", nargs="?", help="Ticker symbol (e.g., AAPL)")
     ap.add_argument("--list", help="Path to JSON array of tickers for batch precompute (e.g., db/top_tickers.json)")
     ap.add_argument("--out-root", default="tickers", help="Output directory root (default: tickers)")
+    ap.add_argument("--store", default=str(facts_store.DEFAULT_DB), help="SQLite fundamentals store to upsert extracted facts into")
+    ap.add_argument("--no-store", action="store_true", help="Skip persisting facts to the fundamentals store")
     args = ap.parse_args()
 
     out_root = Path(args.out_root)
+    store_path = None if args.no_store else Path(args.store)
 
     if args.list:
         tickers = json.loads(Path(args.list).read_text())
-        batch_precompute(tickers, out_root)
+        batch_precompute(tickers, out_root, store_path=store_path)
+        fileio.report("bundles")
         return
 
     # Single ticker path (backwards compatible)
     ticker = (args.ticker or "AAPL").upper().lstrip("$")
     cache_dir = Path("../db"); cache_dir.mkdir(exist_ok=True)
     mapping = load_ticker_map(cache_dir / "company_tickers.json")
-    p = build_bundle(ticker, mapping, out_root)
+    store = facts_store.connect(store_path) if store_path else None
+    p = build_bundle(ticker, mapping, out_root, store=store)
     print(f"Wrote {p.resolve()}")
 
 if __name__ == "__main__":
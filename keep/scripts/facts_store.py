@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Multi-year fundamentals store for the keep/ DCF pipeline.
+
+dcf_metrics.py only keeps the latest fcf0/net_debt/shares in each bundle. This
+module persists every extracted companyfacts point for every ticker into one
+SQLite table so historical and cross-ticker screens are a single indexed query
+instead of a re-fetch from data.sec.gov.
+
+Rows are keyed by (ticker, tag, unit, fy, fp, start, end). `start` is '' for
+instant facts; it has to be part of the key because a 10-Q reports both the
+quarter and the year-to-date duration under the same fy/fp/end. Upserts are
+incremental per accession: points from accessions already ingested for a
+ticker are skipped, and a restated value only replaces a stored one when it
+was filed later.
+
+Usage:
+  # every ticker's FY2024 operating cash flow, largest first
+  python facts_store.py --tag NetCashProvidedByUsedInOperatingActivities --fy 2024
+
+  # one ticker's history for a tag
+  python facts_store.py --ticker AAPL --tag PaymentsToAcquirePropertyPlantAndEquipment
+"""
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+DEFAULT_DB = Path("../db/facts.sqlite")
+TAXONOMIES = ("us-gaap", "dei")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS facts (
+    ticker   TEXT NOT NULL,
+    taxonomy TEXT NOT NULL,
+    tag      TEXT NOT NULL,
+    unit     TEXT NOT NULL,
+    fy       INTEGER NOT NULL,
+    fp       TEXT NOT NULL,
+    start    TEXT NOT NULL,
+    end      TEXT NOT NULL,
+    val      REAL,
+    form     TEXT,
+    accn     TEXT,
+    filed    TEXT,
+    PRIMARY KEY (ticker, tag, unit, fy, fp, start, end)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS facts_tag_fy ON facts (tag, fy, fp);
+CREATE TABLE IF NOT EXISTS accessions (
+    ticker   TEXT NOT NULL,
+    accn     TEXT NOT NULL,
+    cik      TEXT,
+    ingested REAL,
+    PRIMARY KEY (ticker, accn)
+) WITHOUT ROWID;
+"""
+
+UPSERT = """
+INSERT INTO facts (ticker, taxonomy, tag, unit, fy, fp, start, end, val, form, accn, filed)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (ticker, tag, unit, fy, fp, start, end) DO UPDATE SET
+    taxonomy = excluded.taxonomy,
+    val = excluded.val,
+    form = excluded.form,
+    accn = excluded.accn,
+    filed = excluded.filed
+WHERE excluded.filed >= facts.filed
+"""
+
+
+def connect(path: Path = DEFAULT_DB) -> sqlite3.Connection:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def ingested_accessions(conn: sqlite3.Connection, ticker: str) -> set:
+    rows = conn.execute("SELECT accn FROM accessions WHERE ticker = ?", (ticker,))
+    return {r[0] for r in rows}
+
+
+def _fact_rows(ticker: str, facts: dict, skip_accns: set, taxonomies: Iterable[str]):
+    for taxonomy in taxonomies:
+        for tag, body in (facts.get("facts", {}).get(taxonomy) or {}).items():
+            for unit, pts in (body.get("units") or {}).items():
+                for p in pts:
+                    accn = p.get("accn")
+                    if accn in skip_accns or p.get("fy") is None:
+                        continue
+                    yield (ticker, taxonomy, tag, unit, int(p["fy"]), p.get("fp") or "",
+                           p.get("start") or "", p.get("end") or "", p.get("val"),
+                           p.get("form"), accn, p.get("filed") or "")
+
+
+def upsert_companyfacts(conn: sqlite3.Connection, ticker: str, cik: str, facts: dict,
+                        taxonomies: Iterable[str] = TAXONOMIES) -> int:
+    """Store every point of a companyfacts payload that came from an accession
+    not yet ingested for `ticker`. Returns the number of rows written."""
+    ticker = ticker.upper().lstrip("$")
+    seen = ingested_accessions(conn, ticker)
+    rows = list(_fact_rows(ticker, facts, seen, taxonomies))
+    new_accns = {r[10] for r in rows if r[10]}
+    now = time.time()
+    with conn:
+        conn.executemany(UPSERT, rows)
+        conn.executemany(
+            "INSERT OR IGNORE INTO accessions (ticker, accn, cik, ingested) VALUES (?, ?, ?, ?)",
+            [(ticker, a, cik, now) for a in sorted(new_accns)],
+        )
+    return len(rows)
+
+
+def screen(conn: sqlite3.Connection, tag: str, fy: Optional[int] = None, fp: str = "FY") -> List[tuple]:
+    """Latest value of `tag` per ticker for one fiscal period, largest first.
+    Full-year duration facts win over shorter ones that share the same fy/fp."""
+    sql = """
+    SELECT ticker, fy, fp, start, end, val, unit, accn FROM (
+        SELECT f.*, ROW_NUMBER() OVER (
+            PARTITION BY ticker ORDER BY fy DESC, end DESC, start ASC
+        ) AS rn
+        FROM facts f
+        WHERE tag = ? AND fp = ? AND (? IS NULL OR fy = ?)
+    ) WHERE rn = 1
+    ORDER BY val DESC
+    """
+    return conn.execute(sql, (tag, fp, fy, fy)).fetchall()
+
+
+def history(conn: sqlite3.Connection, ticker: str, tag: str) -> List[tuple]:
+    sql = """
+    SELECT fy, fp, start, end, val, unit, form, accn, filed FROM facts
+    WHERE ticker = ? AND tag = ?
+    ORDER BY end, start
+    """
+    return conn.execute(sql, (ticker.upper().lstrip("$"), tag)).fetchall()
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Query the multi-year fundamentals store written by dcf_metrics.py.")
+    ap.add_argument("--db", default=str(DEFAULT_DB), help=f"SQLite store path (default: {DEFAULT_DB})")
+    ap.add_argument("--tag", required=True, help="XBRL tag, e.g. NetCashProvidedByUsedInOperatingActivities")
+    ap.add_argument("--ticker", help="Show one ticker's history instead of a cross-ticker screen")
+    ap.add_argument("--fy", type=int, help="Fiscal year to screen (default: latest per ticker)")
+    ap.add_argument("--fp", default="FY", help="Fiscal period to screen (default: FY)")
+    args = ap.parse_args()
+
+    conn = connect(Path(args.db))
+    if args.ticker:
+        for row in history(conn, args.ticker, args.tag):
+            print("\t".join("" if v is None else str(v) for v in row))
+        return
+    for row in screen(conn, args.tag, args.fy, args.fp):
+        print("\t".join("" if v is None else str(v) for v in row))
+
+
+if __name__ == "__main__":
+    main()
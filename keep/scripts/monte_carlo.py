@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo DCF: percentile bands for intrinsic value per share.
+
+Growth, terminal growth and WACC are drawn from independent distributions and
+pushed through dcf_engine in fixed-size chunks, so a million draws per ticker
+never hold more than one chunk in memory. Values are accumulated into a fine
+histogram whose range comes from a pilot chunk; percentiles are read off its
+CDF (error is at most one bin, 1/8192 of the range). Draws where WACC does not
+exceed terminal growth have no DCF value and are dropped; the kept fraction is
+reported as `valid`.
+
+Distribution specs are "kind:a:b[:c]" in percent:
+  normal:mean:sd   uniform:low:high   triangular:low:mode:high
+
+Usage:
+  # bands for every bundle, spread over all cores
+  python monte_carlo.py --draws 1000000
+
+  python monte_carlo.py AAPL MSFT --wacc normal:9:1.5 --growth uniform:2:8
+"""
+import json
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+import dcf_engine
+import render_dcf_html
+
+DRAWS = 1_000_000
+CHUNK = 100_000
+BINS = 8192
+PERCENTILES = (5, 25, 50, 75, 95)
+DEFAULT_DISTS = {
+    "growth": "normal:5:2",
+    "terminal_growth": "triangular:1.5:2.5:3",
+    "wacc": "normal:9:1.5",
+}
+
+
+def parse_dist(spec: str):
+    kind, *params = spec.split(":")
+    params = [float(p) for p in params]
+    arity = {"normal": 2, "uniform": 2, "triangular": 3}
+    if kind not in arity or len(params) != arity[kind]:
+        raise ValueError(f"Bad distribution spec: {spec!r}")
+    return kind, params
+
+
+def _sample(rng: np.random.Generator, spec: str, n: int) -> np.ndarray:
+    kind, p = parse_dist(spec)
+    if kind == "normal":
+        return rng.normal(p[0], p[1], n)
+    if kind == "uniform":
+        return rng.uniform(p[0], p[1], n)
+    return rng.triangular(p[0], p[1], p[2], n)
+
+
+def _chunk_values(rng, fcf0, net_debt, shares, dists, n, years) -> np.ndarray:
+    g = _sample(rng, dists["growth"], n)
+    gt = _sample(rng, dists["terminal_growth"], n)
+    r = _sample(rng, dists["wacc"], n)
+    v = dcf_engine.intrinsic_values([fcf0], [net_debt], [shares], r, g, gt, years=years)[0]
+    return v[np.isfinite(v)]
+
+
+def simulate(fcf0: float, net_debt: float, shares: float, draws: int = DRAWS,
+             dists: Optional[Dict[str, str]] = None, years: int = dcf_engine.YEARS,
+             seed: int = 0, chunk: int = CHUNK) -> dict:
+    """Percentile bands of value per share over `draws` sampled scenarios."""
+    dists = {**DEFAULT_DISTS, **(dists or {})}
+    rng = np.random.default_rng(seed)
+
+    pilot = _chunk_values(rng, fcf0, net_debt, shares, dists, min(chunk, draws), years)
+    done = min(chunk, draws)
+    if pilot.size == 0:
+        return {"draws": draws, "valid": 0.0, "bands": {}}
+    lo, hi = np.quantile(pilot, [0.001, 0.999])
+    pad = (hi - lo) * 0.5 or abs(lo) * 0.01 or 1.0
+    edges = np.linspace(lo - pad, hi + pad, BINS + 1)
+    counts = np.zeros(BINS, dtype=np.int64)
+    under = over = valid = 0
+
+    def accumulate(v):
+        nonlocal under, over, valid
+        valid += v.size
+        under += int((v < edges[0]).sum())
+        over += int((v >= edges[-1]).sum())
+        counts[:] += np.histogram(v, bins=edges)[0]
+
+    accumulate(pilot)
+    while done < draws:
+        n = min(chunk, draws - done)
+        accumulate(_chunk_values(rng, fcf0, net_debt, shares, dists, n, years))
+        done += n
+
+    # Percentiles from the CDF; mass outside the histogram clamps to its edges.
+    cdf = under + np.cumsum(counts)
+    bands = {}
+    for p in PERCENTILES:
+        target = p / 100 * valid
+        i = int(np.searchsorted(cdf, target))
+        if target <= under or i >= BINS:
+            bands[f"p{p}"] = float(edges[0] if target <= under else edges[-1])
+            continue
+        before = cdf[i - 1] if i else under
+        frac = (target - before) / counts[i] if counts[i] else 0.0
+        bands[f"p{p}"] = float(edges[i] + frac * (edges[i + 1] - edges[i]))
+    return {"draws": draws, "valid": valid / draws, "dists": dists, "bands": bands}
+
+
+def ticker_seed(ticker: str) -> int:
+    """Stable per-ticker seed so re-renders produce identical bands."""
+    return zlib.crc32(ticker.upper().encode())
+
+
+def simulate_bundle(bundle: dict, draws: int = DRAWS, dists: Optional[Dict[str, str]] = None) -> dict:
+    fcf0, net_debt, shares = render_dcf_html.page_inputs(bundle)
+    return simulate(fcf0, net_debt, shares, draws=draws, dists=dists, seed=ticker_seed(bundle.get("ticker", "")))
+
+
+def _simulate_path(args) -> tuple:
+    path, draws, dists = args
+    bundle = json.loads(Path(path).read_text())
+    return bundle.get("ticker") or Path(path).stem, simulate_bundle(bundle, draws, dists)
+
+
+def simulate_many(paths, draws: int = DRAWS, dists: Optional[Dict[str, str]] = None,
+                  workers: Optional[int] = None) -> Dict[str, dict]:
+    """Bands for many bundles, one ticker per task across a process pool."""
+    jobs = [(str(p), draws, dists) for p in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(_simulate_path, jobs))
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Monte Carlo percentile bands for intrinsic value per share.")
+    ap.add_argument("tickers", nargs="*", help="Tickers (default: every bundle under --root)")
+    ap.add_argument("--root", default="../tickers", help="Bundle root (default: ../tickers)")
+    ap.add_argument("--draws", type=int, default=DRAWS, help=f"Draws per ticker (default: {DRAWS})")
+    ap.add_argument("--growth", default=DEFAULT_DISTS["growth"], help="FCF growth distribution, %%")
+    ap.add_argument("--terminal-growth", default=DEFAULT_DISTS["terminal_growth"], help="Terminal growth distribution, %%")
+    ap.add_argument("--wacc", default=DEFAULT_DISTS["wacc"], help="Discount rate distribution, %%")
+    ap.add_argument("--workers", type=int, default=None, help="Processes (default: CPU count)")
+    args = ap.parse_args()
+
+    dists = {"growth": args.growth, "terminal_growth": args.terminal_growth, "wacc": args.wacc}
+    for spec in dists.values():
+        parse_dist(spec)
+    root = Path(args.root)
+    if args.tickers:
+        paths = [root / t.upper() / f"{t.upper()}.json" for t in args.tickers]
+    else:
+        paths = [p for p in sorted(root.glob("*/*.json")) if p.stem == p.parent.name]
+
+    results = simulate_many(paths, draws=args.draws, dists=dists, workers=args.workers)
+    print("ticker\tvalid\t" + "\t".join(f"p{p}" for p in PERCENTILES))
+    for t, res in results.items():
+        bands = res["bands"]
+        print(f"{t}\t{res['valid']:.3f}\t" + "\t".join(f"{bands.get(f'p{p}', float('nan')):.2f}" for p in PERCENTILES))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Local per-day prior-close cache in front of Stooq.
+
+Closes are stored in SQLite keyed by (ticker, day), where day is the last US
+trading session whose close should be published (session_day: weekdays after
+SETTLE_HOUR New York time, else the weekday before). A close looked up at
+10 am is therefore the previous session's, and it is looked up again once
+today's session has settled. Repeated lookups for the same session are served
+from the cache. Failed lookups (stored as NULL) are only trusted for MISS_TTL
+seconds, so a delisted ticker doesn't cost a request on every render but one
+timeout doesn't pin "no price" for the day. Misses are fetched concurrently
+through render_dcf_html.stooq_prior_close, which only asks Stooq for the last
+couple of weeks of bars. Pass refresh=True (--refresh) to skip cached values.
+
+Usage:
+  # print prior closes for a list, fetching only what today's cache lacks
+  python price_cache.py AAPL MSFT F
+
+  python price_cache.py --list ../db/top_tickers.json --refresh
+"""
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import render_dcf_html
+
+try:
+    from zoneinfo import ZoneInfo  # optional (tz database; falls back to fixed UTC-5)
+    MARKET_TZ = ZoneInfo("America/New_York")
+except Exception:
+    MARKET_TZ = timezone(timedelta(hours=-5))
+
+DEFAULT_DB = Path("../db/prices.sqlite")
+SETTLE_HOUR = 18     # New York time; the 4 pm close is on Stooq well before this
+MISS_TTL = 3600      # seconds a failed lookup is served from the cache
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS closes (
+    ticker  TEXT NOT NULL,
+    day     TEXT NOT NULL,
+    close   REAL,
+    fetched REAL,
+    PRIMARY KEY (ticker, day)
+) WITHOUT ROWID;
+"""
+
+
+def session_day(now: Optional[datetime] = None) -> str:
+    """ISO date of the latest session whose close is settled (holidays aren't
+    skipped; they just key the same close under one more day)."""
+    now = (now or datetime.now(timezone.utc)).astimezone(MARKET_TZ)
+    day = now.date() if now.hour >= SETTLE_HOUR else now.date() - timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day.isoformat()
+
+
+def _norm(ticker: str) -> str:
+    return ticker.upper().lstrip("$")
+
+
+class PriceCache:
+    """Thread-safe wrapper around the closes table; one connection, one lock."""
+
+    def __init__(self, path: Path = DEFAULT_DB):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(closes)")}
+        if "fetched" not in columns:  # caches written before misses expired
+            with self._conn:
+                self._conn.execute("ALTER TABLE closes ADD COLUMN fetched REAL")
+                self._conn.execute("DELETE FROM closes WHERE close IS NULL")
+
+    def get_many(self, tickers: Iterable[str], day: str) -> Dict[str, Optional[float]]:
+        """Cached closes for `day`; tickers absent from the result are cache misses.
+        A stored None only counts while it is younger than MISS_TTL."""
+        tickers = [_norm(t) for t in tickers]
+        out: Dict[str, Optional[float]] = {}
+        fresh = time.time() - MISS_TTL
+        with self._lock:
+            for i in range(0, len(tickers), 500):
+                chunk = tickers[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT ticker, close FROM closes WHERE day = ? AND ticker IN ({marks}) "
+                    f"AND (close IS NOT NULL OR fetched >= ?)", [day, *chunk, fresh])
+                out.update(rows)
+        return out
+
+    def get(self, ticker: str, day: str) -> Tuple[bool, Optional[float]]:
+        found = self.get_many([ticker], day)
+        t = _norm(ticker)
+        return (t in found), found.get(t)
+
+    def put(self, ticker: str, day: str, close: Optional[float]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO closes (ticker, day, close, fetched) VALUES (?, ?, ?, ?)",
+                               (_norm(ticker), day, close, time.time()))
+
+
+def prior_close(ticker: str, cache: Optional[PriceCache] = None, day: Optional[str] = None,
+                refresh: bool = False) -> Optional[float]:
+    day = day or session_day()
+    if cache is not None and not refresh:
+        hit, close = cache.get(ticker, day)
+        if hit:
+            return close
+    close = render_dcf_html.stooq_prior_close(ticker)
+    if cache is not None:
+        cache.put(ticker, day, close)
+    return close
+
+
+def prior_closes(tickers: Iterable[str], cache: Optional[PriceCache] = None, workers: int = 8,
+                 day: Optional[str] = None, refresh: bool = False) -> Dict[str, Optional[float]]:
+    """Closes for every ticker: one cache query, then concurrent fetches for the misses."""
+    day = day or session_day()
+    tickers = list(dict.fromkeys(_norm(t) for t in tickers))
+    out = cache.get_many(tickers, day) if cache is not None and not refresh else {}
+    misses = [t for t in tickers if t not in out]
+    if misses:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for t, close in zip(misses, pool.map(render_dcf_html.stooq_prior_close, misses)):
+                out[t] = close
+                if cache is not None:
+                    cache.put(t, day, close)
+    return {t: out.get(t) for t in tickers}
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Print prior closes, served from the local daily cache where possible.")
+    ap.add_argument("tickers", nargs="*", help="Ticker symbols")
+    ap.add_argument("--list", help="JSON array of tickers")
+    ap.add_argument("--db", default=str(DEFAULT_DB), help=f"SQLite cache path (default: {DEFAULT_DB})")
+    ap.add_argument("--workers", type=int, default=8, help="Concurrent fetches for cache misses (default: 8)")
+    ap.add_argument("--refresh", action="store_true", help="Fetch every ticker again, ignoring cached closes")
+    args = ap.parse_args()
+
+    tickers = list(args.tickers)
+    if args.list:
+        tickers += json.loads(Path(args.list).read_text())
+    if not tickers:
+        raise SystemExit("Provide tickers or --list.")
+
+    for t, close in prior_closes(tickers, PriceCache(Path(args.db)), workers=args.workers,
+                                  refresh=args.refresh).items():
+        print(f"{t}\t{'' if close is None else close}")
+
+
+if __name__ == "__main__":
+    main()
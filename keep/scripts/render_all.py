@@ -5,24 +5,42 @@ then write an index page linking to every ticker.
 
 Default source: tickers/tickers.json (if present). Fallback: db/top_tickers.json.
 
-Usage:
+Usage (from keep/scripts, with the repo root on PYTHONPATH for python.common):
   # Recompute (fetch SEC) and render everything, auto-fill prior close
-  python render_all.py --price auto
+  PYTHONPATH=../.. python render_all.py --price auto
 
   # Only render from existing JSONs (skip SEC fetch)
   python render_all.py --no-fetch --price none
 
   # Specify an explicit list
   python render_all.py --list db/my_list.json
+
+Pages are rendered as a pipeline: prior closes are looked up in a thread pool
+(served from price_cache's per-session SQLite cache, so reruns make no requests
+until the next close settles; --refresh fetches them again),
+HTML is built and minified in a process pool as each price lands, and finished
+pages are written atomically (temp file + rename) with .gz/.br siblings
+(python/common/minify.py). Per-stage timings are printed at the
+end so the slowest stage is easy to spot.
+
+Rebuilds are incremental: tickers/.render_manifest.json records a hash of each
+page's inputs (bundle bytes, price, renderer and minifier source) and only
+pages whose hash changed are re-rendered. Pages whose rendered bytes are identical to the
+file on disk are not rewritten, so their mtimes and the Pages diff stay put.
+Pass --force to ignore the manifest.
 """
 from __future__ import annotations
-import argparse, json, time
+import argparse, hashlib, json, time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
 import dcf_metrics           # batch_precompute, etc.
-import render_dcf_html       # render_html(), stooq_prior_close()
+import render_dcf_html       # build_html()
+import price_cache           # PriceCache, prior_close()
+from python.common import fileio, minify  # write_json(); minify_html(), publish()
 
 CSS = "https://alaskamoves.us/styles/css/dcf.css"
+MANIFEST = Path("../tickers/.render_manifest.json")
 
 
 def load_ticker_list(list_arg: str | None) -> List[str]:
@@ -74,32 +92,191 @@ def precompute_if_needed(tickers: List[str], do_fetch: bool) -> Path:
                 })
             except Exception:
                 continue
-    idx.write_text(json.dumps(rows, indent=2))
+    fileio.write_json(idx, rows)
     return idx
 
 
-def render_ticker_page(ticker: str, price_mode: str) -> Path:
+def bundle_path(ticker: str) -> Path:
     t = ticker.upper().lstrip('$')
     in_path = Path("../tickers") / t / f"{t}.json"
     if not in_path.exists():
         alt = Path("../tickers") / f"{t}.json"
         in_path = alt if alt.exists() else in_path
+    return in_path
+
+
+def load_manifest(path: Path = MANIFEST) -> dict:
+    if path.exists():
+        try:
+            return json.loads(path.read_text())
+        except Exception:
+            pass
+    return {"pages": {}, "index": None}
+
+
+def save_manifest(manifest: dict, path: Path = MANIFEST) -> None:
+    fileio.write_json(path, manifest, sort_keys=True)
+
+
+def _template_key() -> str:
+    """Everything that shapes a page besides its inputs: the renderer's source
+    (head, body markup, tail, helpers), the minifier's and, when it's importable,
+    the sensitivity-surface engine's, plus TEMPLATE_VERSION for anything else."""
+    h = hashlib.sha256(render_dcf_html.TEMPLATE_VERSION.encode("utf-8"))
+    modules = [render_dcf_html, minify]
+    if render_dcf_html.dcf_engine is not None:
+        modules.append(render_dcf_html.dcf_engine)
+    for module in modules:
+        h.update(Path(module.__file__).read_bytes())
+    return h.hexdigest()
+
+
+def page_key(bundle_bytes: bytes, auto_price: Optional[float], template_key: str, mc: Optional[dict] = None) -> str:
+    h = hashlib.sha256(bundle_bytes)
+    h.update(repr(auto_price).encode())
+    h.update(template_key.encode())
+    if mc:
+        h.update(json.dumps(mc, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def _fetch_price(ticker: str, price_mode: str, cache: Optional[price_cache.PriceCache] = None,
+                 refresh: bool = False) -> Tuple[Optional[float], float]:
+    t0 = time.perf_counter()
+    price = price_cache.prior_close(ticker, cache, refresh=refresh) if price_mode == "auto" else None
+    return price, time.perf_counter() - t0
+
+
+def _render_page(in_path: str, auto_price: Optional[float], mc: Optional[dict] = None) -> Tuple[str, float]:
+    # Runs in a worker process: re-reads the bundle there so only paths cross the pipe.
+    # Monte Carlo bands (if requested) are simulated here too, one ticker per process.
+    t0 = time.perf_counter()
+    bundle = json.loads(Path(in_path).read_text())
+    bands = None
+    if mc:
+        import monte_carlo
+        bands = monte_carlo.simulate_bundle(bundle, draws=mc["draws"], dists=mc.get("dists"))
+    html = minify.minify_html(render_dcf_html.build_html(bundle, auto_price=auto_price, mc_bands=bands))
+    return html, time.perf_counter() - t0
+
+
+class StageTimer:
+    """Busy time (sum over tasks) and wall span (first start to last finish) per stage."""
+
+    def __init__(self):
+        self.busy: Dict[str, float] = {}
+        self.count: Dict[str, int] = {}
+        self.first: Dict[str, float] = {}
+        self.last: Dict[str, float] = {}
+
+    def start(self, stage: str) -> None:
+        self.first.setdefault(stage, time.perf_counter())
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.busy[stage] = self.busy.get(stage, 0.0) + seconds
+        self.count[stage] = self.count.get(stage, 0) + 1
+        self.last[stage] = time.perf_counter()
+
+    def report(self, wall: float) -> None:
+        for stage in self.busy:
+            span = self.last[stage] - self.first[stage]
+            print(f"  {stage:<6} n={self.count[stage]:<4} busy={self.busy[stage]:.2f}s span={span:.2f}s")
+        print(f"  total  wall={wall:.2f}s")
+
+
+def render_ticker_pages(tickers: List[str], price_mode: str, workers: Optional[int] = None,
+                        price_workers: int = 8, manifest: Optional[dict] = None,
+                        mc: Optional[dict] = None, refresh: bool = False) -> List[Path]:
+    """Fetch prices, render and write every ticker page as one overlapping pipeline.
+    With a manifest, pages whose input hash is unchanged skip the render stage and
+    the manifest is updated in place for each page written. `mc` ({"draws", "dists"})
+    adds Monte Carlo bands to every page. `refresh` skips cached prior closes."""
+    timer = StageTimer()
+    t_start = time.perf_counter()
+    written: List[Path] = []
+    pages = manifest.setdefault("pages", {}) if manifest is not None else {}
+    template_key = _template_key()
+    keys: Dict[str, str] = {}
+    skipped = 0
+    cache = price_cache.PriceCache() if price_mode == "auto" else None
+
+    paths = {}
+    for t in (x.upper().lstrip('$') for x in tickers):
+        in_path = bundle_path(t)
+        if not in_path.exists():
+            print(f"WARN {t}: missing dcf json: {in_path}")
+            continue
+        paths[t] = in_path
+
+    with ThreadPoolExecutor(max_workers=price_workers) as prices, \
+            ProcessPoolExecutor(max_workers=workers) as renders:
+        pending = {}
+        timer.start("price")
+        for t in paths:
+            pending[prices.submit(_fetch_price, t, price_mode, cache, refresh)] = ("price", t)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                stage, t = pending.pop(fut)
+                try:
+                    result, seconds = fut.result()
+                except Exception as e:
+                    print(f"FAIL {t} ({stage}): {e}")
+                    continue
+                timer.add(stage, seconds)
+                out_path = Path("../tickers") / t / f"{t}.html"
+                if stage == "price":
+                    keys[t] = page_key(paths[t].read_bytes(), result, template_key, mc)
+                    if manifest is not None and pages.get(t) == keys[t] and out_path.exists():
+                        skipped += 1
+                        continue
+                    timer.start("render")
+                    pending[renders.submit(_render_page, str(paths[t]), result, mc)] = ("render", t)
+                    continue
+
+                timer.start("write")
+                t0 = time.perf_counter()
+                changed = minify.publish(out_path, result, do_minify=False)
+                timer.add("write", time.perf_counter() - t0)
+                pages[t] = keys[t]
+                if changed:
+                    written.append(out_path)
+                    print(f"HTML {t}: {out_path}")
+
+    print(f"Rendered {len(written)} changed page(s); {skipped} unchanged by manifest.")
+    print("Stage timings:")
+    timer.report(time.perf_counter() - t_start)
+    return written
+
+
+def render_ticker_page(ticker: str, price_mode: str, refresh: bool = False) -> Path:
+    t = ticker.upper().lstrip('$')
+    in_path = bundle_path(t)
     if not in_path.exists():
         print(f"WARN {t}: missing dcf json: {in_path}")
         return Path()
 
-    bundle = json.loads(in_path.read_text())
-    auto_price = render_dcf_html.stooq_prior_close(t) if price_mode == "auto" else None
+    cache = price_cache.PriceCache() if price_mode == "auto" else None
+    auto_price, _ = _fetch_price(t, price_mode, cache, refresh)
+    html, _ = _render_page(str(in_path), auto_price)
 
     out_path = Path("../tickers") / f"{t}" / f"{t}.html"
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    render_dcf_html.render_html(bundle, out_path, auto_price=auto_price)
+    minify.publish(out_path, html, do_minify=False)
     print(f"HTML {t}: {out_path}")
     return out_path
 
 
-def render_index(idx_path: Path) -> Path:
-    data = json.loads(idx_path.read_text()) if idx_path.exists() else []
+def render_index(idx_path: Path, manifest: Optional[dict] = None) -> Path:
+    raw = idx_path.read_bytes() if idx_path.exists() else b"[]"
+    out = Path("../tickers/index.html")
+    key = hashlib.sha256(raw + _template_key().encode()).hexdigest()
+    if manifest is not None:
+        if manifest.get("index") == key and out.exists():
+            print(f"Index unchanged: {out.resolve()}")
+            return out
+        manifest["index"] = key
+    data = json.loads(raw)
 
     rows = []
     for row in data:
@@ -148,9 +325,7 @@ def render_index(idx_path: Path) -> Path:
 </div>
 </body>
 </html>"""
-    out = Path("../tickers/index.html")
-    out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(html, encoding="utf-8")
+    minify.publish(out, html)
     print(f"Wrote index: {out.resolve()}")
     return out
 
@@ -160,17 +335,26 @@ def main():
     ap.add_argument("--list", help="Explicit JSON list of tickers (overrides tickers/tickers.json)")
     ap.add_argument("--no-fetch", action="store_true", help="Skip SEC fetch; render from existing JSONs")
     ap.add_argument("--price", choices=["auto", "none"], default="none", help="Auto-fill prior close on pages")
+    ap.add_argument("--workers", type=int, default=None, help="Render processes (default: CPU count)")
+    ap.add_argument("--price-workers", type=int, default=8, help="Concurrent price fetches (default: 8)")
+    ap.add_argument("--force", action="store_true", help="Ignore the render manifest and re-render every page")
+    ap.add_argument("--refresh", action="store_true", help="Re-fetch prior closes instead of using the price cache")
+    ap.add_argument("--mc-draws", type=int, default=0, help="Monte Carlo draws per ticker for value bands (default: 0 = off)")
     args = ap.parse_args()
 
     tickers = load_ticker_list(args.list)
     idx_path = precompute_if_needed(tickers, do_fetch=not args.no_fetch)
+    manifest = {"pages": {}, "index": None} if args.force else load_manifest()
 
     # Render per-ticker pages
-    for t in tickers:
-        render_ticker_page(t, price_mode=args.price)
+    render_ticker_pages(tickers, price_mode=args.price, workers=args.workers,
+                        price_workers=args.price_workers, manifest=manifest,
+                        mc={"draws": args.mc_draws} if args.mc_draws else None, refresh=args.refresh)
 
     # Re-read index and render dashboard
-    render_index(idx_path)
+    render_index(idx_path, manifest=manifest)
+    save_manifest(manifest)
+    fileio.report("output files")
 
 
 if __name__ == "__main__":
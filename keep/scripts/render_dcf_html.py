@@ -5,9 +5,9 @@ It fills FCF₀ (CFO - |CapEx|), Shares Outstanding, and Net Debt if available,
 then asks the user for current price (or can auto-fill prior close via --price auto
 using Stooq's CSV endpoint, no API key required).
 
-Usage:
+Usage (from keep/scripts; python.common needs the repo root on PYTHONPATH):
   # default uses tickers/AAPL/AAPL_xbrl_dump.json and writes tickers/AAPL/dcf_AAPL.html
-  python render_dcf_html.py AAPL
+  PYTHONPATH=../.. python render_dcf_html.py AAPL
 
   # explicit JSON path and auto-price
   python render_dcf_html.py tickers/MSFT/MSFT_xbrl_dump.json --price auto
@@ -21,12 +21,20 @@ import argparse
 from pathlib import Path
 from typing import Optional, Tuple, Union
 import html as _html
+from datetime import date, timedelta
 
 try:
     import requests  # optional (only used for --price auto)
 except Exception:
     requests = None
 
+try:
+    import dcf_engine  # optional (needs NumPy; precomputes the sensitivity grid)
+except Exception:
+    dcf_engine = None
+
+from python.common import minify
+
 # --- Minimal US-GAAP tag sets to derive inputs ---
 TAGS = {
     # Cash flow
@@ -90,9 +98,10 @@ def derive_inputs(bundle: dict):
     }
 
 
-def stooq_prior_close(ticker: str) -> Optional[float]:
+def stooq_prior_close(ticker: str, timeout: float = 10, window_days: int = 14) -> Optional[float]:
     """Fetch prior close from Stooq daily CSV (no key). Ticker is assumed US if it lacks a suffix.
     We try <TICKER>.US first, then the raw ticker. Returns close as float or None on error.
+    Only the last `window_days` of history are requested (d1/d2), not the full series.
     """
     if requests is None:
         return None
@@ -101,10 +110,12 @@ def stooq_prior_close(ticker: str) -> Optional[float]:
     if "." not in t:
         candidates.append(f"{t}.US")
     candidates.append(t)
+    d2 = date.today()
+    d1 = d2 - timedelta(days=window_days)
     for sym in candidates:
-        url = f"https://stooq.com/q/d/l/?s={sym.lower()}&i=d"
+        url = f"https://stooq.com/q/d/l/?s={sym.lower()}&d1={d1:%Y%m%d}&d2={d2:%Y%m%d}&i=d"
         try:
-            r = requests.get(url, timeout=10)
+            r = requests.get(url, timeout=timeout)
             if r.status_code != 200 or not r.text.strip():
                 continue
             lines = [ln.strip() for ln in r.text.splitlines() if ln.strip()]
@@ -119,6 +130,11 @@ def stooq_prior_close(ticker: str) -> Optional[float]:
     return None
 
 
+# render_all.py keys its render manifest on this module's and the minifier's
+# source, so edits here re-render pages on their own. Bump this only when the
+# output changes through something else (a data file, a library upgrade).
+TEMPLATE_VERSION = "3"
+
 HTML_HEAD = """<!DOCTYPE html>
 <html lang=\"en\">
 <head>
@@ -225,7 +241,32 @@ HTML_TAIL = """
     scales: {\n            x: { title: { display: true, text: 'Discount Rate (%)' } },\n            
     y: { title: { display: true, text: 'Value / Share (USD)' }, beginAtZero: false }\n          
     }\n        }\n    });\n    }\n\n    
-    function updateChartSensitivity({ fcf0, years, growth, terminalGrowth, netDebt, shares }) {\n      
+    function gridSeries({ fcf0, years, growth, terminalGrowth, netDebt, shares }) {
+      // Precomputed server-side surface (dcf_engine.ivps_grid); only valid for the pre-filled inputs.
+      const G = window.DCF_GRID;
+      if (!G || years !== G.years || fcf0 !== G.fcf0 || netDebt !== G.netDebt || shares !== G.shares) return null;
+      const gi = G.growth.indexOf(growth), ti = G.terminalGrowth.indexOf(terminalGrowth);
+      if (gi < 0 || ti < 0) return null;
+      if (!G.values) G.values = new Float32Array(Uint8Array.from(atob(G.data), c => c.charCodeAt(0)).buffer);
+      const n = G.discount.length, off = (ti * G.growth.length + gi) * n;
+      const xs = [], ys = [];
+      for (let i = 0; i < n; i++) {
+        const v = G.values[off + i];
+        if (isNaN(v)) continue;
+        xs.push(G.discount[i].toFixed(2));
+        ys.push(v);
+      }
+      return { xs, ys };
+    }
+
+    function updateChartSensitivity({ fcf0, years, growth, terminalGrowth, netDebt, shares }) {
+      const pre = gridSeries({ fcf0, years, growth, terminalGrowth, netDebt, shares });
+      if (pre) {
+        chart.data.labels = pre.xs;
+        chart.data.datasets[0].data = pre.ys;
+        chart.update();
+        return;
+      }
     const xs = [];\n      const ys = [];\n      for (let r = 4; r <= 20.01; r += 0.25) {\n        
     const res = dcf({ fcf0, years, growth, terminalGrowth, discount: r, netDebt, shares });\n        
     if (res.error) { continue; }\n        const ivps = res.equity / shares;\n        
@@ -235,10 +276,8 @@ HTML_TAIL = """
     </body>\n</html>\n"""
 
 
-def render_html(bundle: dict, out_path: Path, auto_price: Optional[float] = None):
-    tkr = bundle.get("ticker", "—")
-    name = bundle.get("companyName", "—")
-
+def page_inputs(bundle: dict) -> Tuple[float, float, float]:
+    """(fcf0, net_debt, shares) exactly as the page pre-fills them."""
     derived = bundle.get("derived") or {}
     fcf0 = derived.get("fcf0")
     net_debt = derived.get("net_debt")
@@ -249,9 +288,41 @@ def render_html(bundle: dict, out_path: Path, auto_price: Optional[float] = None
         fcf0 = fcf0 if fcf0 is not None else _fallback.get("fcf0")
         net_debt = net_debt if net_debt is not None else _fallback.get("net_debt")
         shares = shares if shares is not None else _fallback.get("shares")
-    fcf0 = fcf0 or 0
-    net_debt = net_debt or 0
-    shares = shares or 1
+    return fcf0 or 0, net_debt or 0, shares or 1
+
+
+def _bands_html(mc: dict) -> str:
+    bands = mc.get("bands") or {}
+    if not bands:
+        return ""
+    cells = "".join(
+        f'<div class=\"p-2 rounded-xl bg-zinc-50 dark:bg-zinc-800\"><div class=\"hint\">{_html.escape(k.upper())}</div>'
+        f'<div class=\"font-semibold\">${v:,.2f}</div></div>'
+        for k, v in bands.items()
+    )
+    dists = mc.get("dists") or {}
+    note = " · ".join(f"{_html.escape(k)} {_html.escape(v)}" for k, v in dists.items())
+    return f"""
+        <div class=\"h-px bg-zinc-200 dark:bg-zinc-800\"></div>
+        <div>
+          <h3 class=\"font-semibold mb-2\">Monte Carlo Value / Share</h3>
+          <div class=\"grid grid-cols-5 gap-2\">{cells}</div>
+          <p class=\"hint mt-1\">{mc.get('draws', 0):,} draws ({mc.get('valid', 0) * 100:.1f}% valid) · {note}</p>
+        </div>"""
+
+
+def build_html(bundle: dict, auto_price: Optional[float] = None, mc_bands: Optional[dict] = None) -> str:
+    """Full page HTML. `mc_bands` is a monte_carlo.simulate() result to show under Results."""
+    tkr = bundle.get("ticker", "—")
+    name = bundle.get("companyName", "—")
+    fcf0, net_debt, shares = page_inputs(bundle)
+    bands = _bands_html(mc_bands) if mc_bands else ""
+
+    grid = ""
+    if dcf_engine is not None:
+        # Same rounded values the inputs are pre-filled with, so the page can match them exactly.
+        payload = dcf_engine.grid_payload(int(round(fcf0)), int(round(net_debt)), int(round(shares)))
+        grid = f"\n    <script>window.DCF_GRID = {json.dumps(payload, separators=(',', ':'))};</script>\n"
 
     header = f"""
     <header class=\"flex flex-col md:flex-row md:items-end md:justify-between gap-4 mb-6\">
@@ -332,7 +403,7 @@ def render_html(bundle: dict, out_path: Path, auto_price: Optional[float] = None
             <div class=\"p-3 rounded-xl bg-zinc-50 dark:bg-zinc-800\"><div class=\"hint\">Enterprise Value (DCF)</div><div id=\"ev\" class=\"font-semibold\">—</div></div>
             <div class=\"p-3 rounded-xl bg-zinc-50 dark:bg-zinc-800\"><div class=\"hint\">Equity Value</div><div id=\"equity\" class=\"font-semibold\">—</div></div>
           </div>
-        </div>
+        </div>{bands}
         <div class=\"h-px bg-zinc-200 dark:bg-zinc-800\"></div>
         <div><h3 class=\"font-semibold mb-2\">DCF Sensitivity (Value/Share vs Discount Rate)</h3><canvas id=\"chart\" height=\"200\"></canvas></div>
         <details class=\"mt-2\"><summary class=\"cursor-pointer select-none font-medium\">Methodology</summary><div class=\"mt-2 text-sm text-zinc-600 dark:text-zinc-300 space-y-1\"><p>We project FCF for N years with constant growth <em>g</em> and discount at rate <em>r</em>. Terminal value uses Gordon Growth: TV = FCF<sub>N+1</sub> / (r − g<sub>term</sub>). Enterprise value is PV of projected FCFs plus PV(TV). Equity value = Enterprise value − Net Debt. Intrinsic value per share = Equity / Shares.</p><p>Inputs are auto-derived from SEC XBRL where available; you can override any field. Price is the prior close if auto-filled, otherwise enter manually.</p></div></details>
@@ -340,8 +411,12 @@ def render_html(bundle: dict, out_path: Path, auto_price: Optional[float] = None
     </div>
     """
 
-    html = HTML_HEAD + header + inputs + HTML_TAIL
-    out_path.write_text(html, encoding="utf-8")
+    return HTML_HEAD + header + inputs + grid + HTML_TAIL
+
+
+def render_html(bundle: dict, out_path: Path, auto_price: Optional[float] = None, mc_bands: Optional[dict] = None):
+    # Minified, with .gz/.br siblings; an identical page is left untouched.
+    return minify.publish(out_path, build_html(bundle, auto_price=auto_price, mc_bands=mc_bands))
 
 
 def main():
@@ -375,7 +450,8 @@ def main():
 
     auto_price = None
     if args.price == "auto":
-        auto_price = stooq_prior_close(ticker)
+        import price_cache
+        auto_price = price_cache.prior_close(ticker, price_cache.PriceCache())
 
     out_path = Path(args.out) if args.out else (Path("../tickers") / f"{ticker}.html")
     out_path.parent.mkdir(parents=True, exist_ok=True)
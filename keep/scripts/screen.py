@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Rank every ticker bundle by DCF upside at given WACC/growth assumptions.
+
+All bundles under tickers/ are valued in one batched dcf_engine call over the
+cartesian product of the scenario values given, then compared with the prior
+close from price_cache. Tickers are ranked by their worst (or mean) upside
+across scenarios.
+
+Usage:
+  # one scenario, prices from the latest session's cache only (no network)
+  python screen.py --wacc 9 --growth 5 --terminal-growth 2.5
+
+  # 3 x 2 scenarios, fetch missing prices, top 20 by mean upside
+  python screen.py --wacc 8 9 10 --growth 3 6 --price auto --rank-by mean -n 20
+"""
+import argparse
+import itertools
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+import dcf_engine
+import price_cache
+
+
+def scenarios(waccs, growths, terminal_growths):
+    grid = list(itertools.product(waccs, growths, terminal_growths))
+    return [np.array(col, dtype=np.float64) for col in zip(*grid)] if grid else [np.empty(0)] * 3
+
+
+def load_prices(tickers, mode: str, cache: price_cache.PriceCache) -> np.ndarray:
+    if mode == "auto":
+        found = price_cache.prior_closes(tickers, cache)
+    else:
+        found = cache.get_many(tickers, price_cache.session_day())
+    return np.array([found.get(t.upper()) or np.nan for t in tickers], dtype=np.float64)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Rank tickers by DCF upside vs prior close.")
+    ap.add_argument("--root", default="../tickers", help="Bundle root (default: ../tickers)")
+    ap.add_argument("--wacc", type=float, nargs="+", default=[10.0], help="Discount rate(s), %%")
+    ap.add_argument("--growth", type=float, nargs="+", default=[5.0], help="FCF growth rate(s), %%")
+    ap.add_argument("--terminal-growth", type=float, nargs="+", default=[2.5], help="Terminal growth rate(s), %%")
+    ap.add_argument("--years", type=int, default=dcf_engine.YEARS, help=f"Projection years (default: {dcf_engine.YEARS})")
+    ap.add_argument("--price", choices=["auto", "cache"], default="cache",
+                    help="auto: fetch prices missing from the latest session's cache; cache: cached prices only (default)")
+    ap.add_argument("--rank-by", choices=["min", "mean"], default="min", help="Aggregate upside across scenarios")
+    ap.add_argument("-n", "--n", type=int, default=25, help="Rows to print (default: 25)")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    tickers, fcf0, net_debt, shares = dcf_engine.load_bundles(Path(args.root))
+    if not tickers:
+        raise SystemExit(f"No bundles found under {args.root}")
+    prices = load_prices(tickers, args.price, price_cache.PriceCache())
+    t1 = time.perf_counter()
+
+    r, g, gt = scenarios(args.wacc, args.growth, args.terminal_growth)
+    ivps = dcf_engine.intrinsic_values(fcf0, net_debt, shares, r, g, gt, years=args.years)
+    with np.errstate(invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN rows: no cached price
+        upside = (ivps / prices[:, None] - 1) * 100
+        agg = np.nanmin(upside, axis=1) if args.rank_by == "min" else np.nanmean(upside, axis=1)
+    order = np.argsort(np.where(np.isnan(agg), -np.inf, agg))[::-1]
+    t2 = time.perf_counter()
+
+    print(f"{'ticker':<8}{'price':>10}{'ivps(mid)':>12}{'upside%':>10}")
+    mid = ivps.shape[1] // 2
+    for i in order[:args.n]:
+        print(f"{tickers[i]:<8}{prices[i]:>10.2f}{ivps[i, mid]:>12.2f}{agg[i]:>10.1f}")
+    print(f"\n{len(tickers)} tickers x {len(r)} scenarios: load {1000 * (t1 - t0):.1f} ms, value+rank {1000 * (t2 - t1):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,44 +4,181 @@ Output the top-N tickers by transaction magnitude from a ledger CSV, or
 fallback to a default JSON list. Optionally write a JSON file with the
 selected tickers for downstream batch processing.
 
-Usage examples:
+Usage examples (from keep/scripts, repo root on PYTHONPATH for python.common):
   # from CSV, print to stdout and write db/top_tickers.json
-  python top_tickers.py --csv db/fy25_txns.csv -n 10 --json-out db/top_tickers.json
+  PYTHONPATH=../.. python top_tickers.py --csv db/fy25_txns.csv -n 10 --json-out db/top_tickers.json
 
   # use default list when no CSV is provided
   python top_tickers.py --default db/default_tickers.json --json-out db/top_tickers.json
 
   # just print the JSON list to stdout (newline-delimited tickers also printed)
   python top_tickers.py --list db/top_tickers.json
+
+  # rank straight from the stored summary without touching the CSV
+  python top_tickers.py --from-summary -n 10
+
+--csv runs keep per-account totals in db/ledger_summary.sqlite together with
+the byte offset already consumed. As long as the ledger is only appended to
+(same header, same leading bytes), the next run reads just the new tail.
+A rewritten ledger is detected and re-aggregated from scratch.
 """
 
 import argparse
+import csv
+import hashlib
+import heapq
+import io
 import json
+import sqlite3
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, List
 import pandas as pd
-
-
-def compute_top_tickers(csv_path: str, n: int) -> List[str]:
-    df = pd.read_csv(csv_path)
-
-    # Split income vs spend
-    income = df[df["amount"] > 0].groupby("account")["amount"].sum()
-    spending = df[df["amount"] < 0].groupby("account")["amount"].sum()
-
-    # Combine and compute magnitude
-    summary = pd.concat([income, spending], axis=1, keys=["income", "spending"]).fillna(0)
-    summary["magnitude"] = summary["income"].abs() + summary["spending"].abs()
-
-    # Rank by magnitude and take top N
-    top = summary.sort_values("magnitude", ascending=False).head(n)
-    return list(top.index)
+from python.common import fileio
+
+CHUNK_ROWS = 1_000_000
+SUMMARY_DB = "db/ledger_summary.sqlite"
+HEAD_BYTES = 1 << 16   # prefix hashed to detect a rewritten (not appended) ledger
+LEDGER_DTYPES = {"account": "category", "amount": "float64"}
+
+
+def accumulate_chunks(chunks: Iterable[pd.DataFrame], totals: Dict[str, List[float]]) -> Dict[str, List[float]]:
+    """Fold ledger chunks into {account: [income, spending]} magnitudes, in place."""
+    for chunk in chunks:
+        amount = chunk["amount"]
+        chunk = chunk[amount.notna() & (amount != 0)]
+        amount = chunk["amount"]
+        part = pd.DataFrame({
+            "account": chunk["account"],
+            "income": amount.clip(lower=0),
+            "spending": -amount.clip(upper=0),
+        }).groupby("account", observed=True, sort=False).sum()
+        for account, income, spending in part.itertuples():
+            acc = totals.setdefault(str(account), [0.0, 0.0])
+            acc[0] += income
+            acc[1] += spending
+    return totals
+
+
+def read_ledger(source, chunksize: int = CHUNK_ROWS, **kwargs):
+    return pd.read_csv(source, usecols=["account", "amount"], dtype=LEDGER_DTYPES, chunksize=chunksize, **kwargs)
+
+
+def top_n(totals: Dict[str, List[float]], n: int) -> List[str]:
+    best = heapq.nlargest(n, totals.items(), key=lambda kv: kv[1][0] + kv[1][1])
+    return [account for account, _ in best]
+
+
+def compute_top_tickers(csv_path: str, n: int, chunksize: int = CHUNK_ROWS) -> List[str]:
+    # Stream the ledger: only account/amount, one groupby per chunk for both
+    # income and spending, so memory is bounded by the number of accounts.
+    totals = accumulate_chunks(read_ledger(csv_path, chunksize), {})
+
+    # Rank by magnitude (income + |spending|) and take top N
+    return top_n(totals, n)
+
+
+class _Window(io.RawIOBase):
+    """Read-only view of a binary file up to a fixed end offset."""
+
+    def __init__(self, f, end: int):
+        self.f, self.end = f, end
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        n = min(len(b), self.end - self.f.tell())
+        if n <= 0:
+            return 0
+        data = self.f.read(n)
+        b[:len(data)] = data
+        return len(data)
+
+
+def _connect_summary(db_path: str) -> sqlite3.Connection:
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+    CREATE TABLE IF NOT EXISTS accounts (account TEXT PRIMARY KEY, income REAL NOT NULL, spending REAL NOT NULL);
+    CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+    """)
+    return conn
+
+
+def _last_newline_end(f, size: int) -> int:
+    """Offset just past the last newline, so a half-written final row is left for next time."""
+    pos = size
+    while pos > 0:
+        step = min(pos, 1 << 16)
+        f.seek(pos - step)
+        block = f.read(step)
+        i = block.rfind(b"\n")
+        if i >= 0:
+            return pos - step + i + 1
+        pos -= step
+    return 0
+
+
+def update_summary(csv_path: str, db_path: str = SUMMARY_DB, chunksize: int = CHUNK_ROWS) -> int:
+    """Fold any ledger bytes past the stored watermark into the summary. Returns bytes read."""
+    conn = _connect_summary(db_path)
+    meta = dict(conn.execute("SELECT key, value FROM meta"))
+    with open(csv_path, "rb") as f:
+        header = f.readline()
+        size = f.seek(0, io.SEEK_END)
+        offset = int(meta.get("offset", 0))
+        f.seek(0)
+        head = hashlib.sha256(f.read(min(offset, HEAD_BYTES))).hexdigest()
+        appended = (meta.get("source") == str(Path(csv_path).resolve())
+                    and meta.get("header") == header.decode("utf-8", "replace")
+                    and meta.get("head") == head and len(header) <= offset <= size)
+        start = offset if appended else len(header)
+        end = _last_newline_end(f, size)
+
+        totals: Dict[str, List[float]] = {}
+        if end > start:
+            f.seek(start)
+            names = next(csv.reader([header.decode("utf-8")]))
+            accumulate_chunks(read_ledger(io.BufferedReader(_Window(f, end)), chunksize,
+                                          header=None, names=names), totals)
+        f.seek(0)
+        new_head = hashlib.sha256(f.read(min(max(end, start), HEAD_BYTES))).hexdigest()
+
+    with conn:
+        if not appended:
+            conn.execute("DELETE FROM accounts")
+        conn.executemany("""
+            INSERT INTO accounts (account, income, spending) VALUES (?, ?, ?)
+            ON CONFLICT (account) DO UPDATE SET
+                income = income + excluded.income,
+                spending = spending + excluded.spending
+        """, [(a, inc, sp) for a, (inc, sp) in totals.items()])
+        conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", [
+            ("source", str(Path(csv_path).resolve())),
+            ("header", header.decode("utf-8", "replace")),
+            ("offset", str(max(end, start))),
+            ("head", new_head),
+        ])
+    conn.close()
+    return max(end - start, 0)
+
+
+def summary_top_tickers(n: int, db_path: str = SUMMARY_DB) -> List[str]:
+    conn = _connect_summary(db_path)
+    rows = conn.execute("SELECT account FROM accounts ORDER BY income + spending DESC LIMIT ?", (n,))
+    top = [r[0] for r in rows]
+    conn.close()
+    return top
 
 
 def main():
     ap = argparse.ArgumentParser(description="Produce a top-N ticker list (and/or JSON) for downstream processing.")
     ap.add_argument("--csv", help="Path to transactions CSV (expects columns: account, amount)")
     ap.add_argument("-n", "--n", type=int, default=10, help="Number of tickers to select (default: 10)")
+    ap.add_argument("--chunksize", type=int, default=CHUNK_ROWS, help=f"CSV rows per streamed chunk (default: {CHUNK_ROWS})")
+    ap.add_argument("--summary", default=SUMMARY_DB, help=f"Persisted per-account summary (default: {SUMMARY_DB})")
+    ap.add_argument("--no-summary", action="store_true", help="Aggregate the whole CSV without reading or updating the summary")
+    ap.add_argument("--from-summary", action="store_true", help="Rank from the stored summary only; do not read any CSV")
     ap.add_argument("--default", default="db/default_tickers.json", help="Fallback JSON file with a default list (array of tickers)")
     ap.add_argument("--list", help="Existing JSON list (array of tickers) to just echo/validate")
     ap.add_argument("--json-out", default="db/top_tickers.json", help="Path to write the resulting JSON array")
@@ -51,8 +188,13 @@ def main():
 
     if args.list:
         tickers = json.loads(Path(args.list).read_text())
+    elif args.from_summary:
+        tickers = summary_top_tickers(args.n, args.summary)
+    elif args.csv and args.no_summary:
+        tickers = compute_top_tickers(args.csv, args.n, chunksize=args.chunksize)
     elif args.csv:
-        tickers = compute_top_tickers(args.csv, args.n)
+        update_summary(args.csv, args.summary, chunksize=args.chunksize)
+        tickers = summary_top_tickers(args.n, args.summary)
     else:
         # fallback to a default list
         default_path = Path(args.default)
@@ -71,9 +213,7 @@ def main():
             seen.add(s)
 
     # Write JSON output
-    out_path = Path(args.json_out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(norm, indent=2))
+    fileio.write_json(Path(args.json_out), norm)
 
     # Print results for piping convenience
     for t in norm:
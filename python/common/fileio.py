@@ -0,0 +1,134 @@
+# python/common/fileio.py
+# ─────────────────────────────────────────────────────────────────────────────
+# One way to write generated files, shared by python/ and keep/scripts/.
+#
+# Every write goes to a temp file next to the target and is renamed into
+# place, so a crash mid-write never leaves half a JSON file behind. When the
+# new bytes match what's already on disk nothing is written at all, which
+# keeps mtimes (and the Pages diff) still for outputs that didn't change.
+#
+# write_json(..., compact=True) uses orjson when it's installed and falls back
+# to json.dumps with tight separators. Both emit UTF-8 unescaped.
+#
+# Counters for files/bytes written and skipped are kept per process; call
+# report() at the end of a run to print them.
+# ─────────────────────────────────────────────────────────────────────────────
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import orjson  # optional (only used for compact JSON)
+except Exception:
+    orjson = None
+
+_lock = threading.Lock()
+_stats = {"written": 0, "skipped": 0, "bytes_written": 0, "bytes_skipped": 0}
+
+
+def _count(written, size):
+    with _lock:
+        if written:
+            _stats["written"] += 1
+            _stats["bytes_written"] += size
+        else:
+            _stats["skipped"] += 1
+            _stats["bytes_skipped"] += size
+
+
+def _tmp_path(path):
+    return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def _same_file(a, b):
+    if not b.exists() or a.stat().st_size != b.stat().st_size:
+        return False
+    with open(a, "rb") as fa, open(b, "rb") as fb:
+        while True:
+            chunk = fa.read(1 << 16)
+            if chunk != fb.read(1 << 16):
+                return False
+            if not chunk:
+                return True
+
+
+def write_bytes(path, data):
+    """Atomically write `data` to `path` unless it already holds exactly these
+    bytes. Returns True if the file was written."""
+    path = Path(path)
+    try:
+        same = path.stat().st_size == len(data) and path.read_bytes() == data
+    except FileNotFoundError:
+        same = False
+    if same:
+        _count(False, len(data))
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _tmp_path(path)
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    _count(True, len(data))
+    return True
+
+
+def write_text(path, text, encoding="utf-8"):
+    return write_bytes(path, text.encode(encoding))
+
+
+def dumps_json(obj, indent=2, compact=False, sort_keys=False, ensure_ascii=True):
+    """Serialize to bytes. compact=True ignores indent/ensure_ascii and prefers orjson."""
+    if compact:
+        if orjson is not None:
+            opts = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+            return orjson.dumps(obj, option=opts)
+        return json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, indent=indent, sort_keys=sort_keys, ensure_ascii=ensure_ascii).encode("utf-8")
+
+
+def write_json(path, obj, indent=2, compact=False, sort_keys=False, ensure_ascii=True):
+    return write_bytes(path, dumps_json(obj, indent, compact, sort_keys, ensure_ascii))
+
+
+@contextmanager
+def atomic_open(path, mode="wb", **kwargs):
+    """Stream into a temp file; on success it replaces `path` unless the
+    result is identical to the existing file, in which case it's dropped."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _tmp_path(path)
+    try:
+        with open(tmp, mode, **kwargs) as f:
+            yield f
+        size = tmp.stat().st_size
+        if _same_file(tmp, path):
+            _count(False, size)
+        else:
+            os.replace(tmp, path)
+            _count(True, size)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def stats():
+    with _lock:
+        return dict(_stats)
+
+
+def reset_stats():
+    with _lock:
+        for key in _stats:
+            _stats[key] = 0
+
+
+def report(label="files"):
+    s = stats()
+    print(f"✔️ {label}: {s['written']} written ({s['bytes_written']:,} B), "
+          f"{s['skipped']} unchanged ({s['bytes_skipped']:,} B)")
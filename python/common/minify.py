@@ -0,0 +1,138 @@
+# python/common/minify.py
+# ─────────────────────────────────────────────────────────────────────────────
+# Shared post-processing for every generated page: conservative HTML/CSS/JS
+# minification plus precompressed .gz (and .br, if the brotli module is
+# installed) siblings. Nothing is touched when its bytes are already current,
+# so mtimes and the Pages diff only move for pages that really changed.
+#
+# The minifier is deliberately conservative. It drops comments and blank
+# lines and collapses whitespace runs, but it keeps line breaks inside
+# <script> (ASI) and leaves <pre>/<textarea> alone.
+#
+# Usage (from the repo root; paths are relative to the working directory):
+#   python -m python.common.minify dispatch/index.html keep/tickers
+#   python -m python.common.minify --compress-only dispatch/posts
+# ─────────────────────────────────────────────────────────────────────────────
+
+import gzip
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from python.common import fileio
+
+try:
+    import brotli  # optional (only used for .br siblings)
+except Exception:
+    brotli = None
+
+SUFFIXES = {".html", ".htm", ".css", ".js"}
+
+_PROTECTED = re.compile(r"(<(pre|textarea|script|style)\b[^>]*>)(.*?)(</\2\s*>)", re.S | re.I)
+_COMMENT = re.compile(r"<!--(?!\[if).*?-->", re.S)
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+
+
+def _collapse(text):
+    # Any whitespace run becomes one space, or one newline if it contained one.
+    return re.sub(r"\s+", lambda m: "\n" if "\n" in m.group() else " ", text)
+
+
+def minify_css(text):
+    text = _collapse(_CSS_COMMENT.sub("", text))
+    return re.sub(r"\s*([{};,])\s*", r"\1", text).strip()
+
+
+def minify_js(text):
+    # Line-level only: strip indentation and blank lines, keep every line break.
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+
+def minify_html(text):
+    parts = []
+    pos = 0
+    for m in _PROTECTED.finditer(text):
+        parts.append(_collapse(_COMMENT.sub("", text[pos:m.start()])))
+        tag = m.group(2).lower()
+        body = m.group(3)
+        if tag == "script":
+            body = minify_js(body)
+        elif tag == "style":
+            body = minify_css(body)
+        parts.append(_collapse(m.group(1)) + body + m.group(4))
+        pos = m.end()
+    parts.append(_collapse(_COMMENT.sub("", text[pos:])))
+    return "".join(parts).strip() + "\n"
+
+
+def minify(text, suffix):
+    suffix = suffix.lower()
+    if suffix in (".html", ".htm"):
+        return minify_html(text)
+    if suffix == ".css":
+        return minify_css(text) + "\n"
+    if suffix == ".js":
+        return minify_js(text) + "\n"
+    return text
+
+
+def precompress(path, data=None):
+    """Write deterministic .gz/.br siblings of `path`. Returns how many changed."""
+    path = Path(path)
+    data = path.read_bytes() if data is None else data
+    changed = fileio.write_bytes(path.with_name(path.name + ".gz"), gzip.compress(data, 9, mtime=0))
+    if brotli is not None:
+        changed += fileio.write_bytes(path.with_name(path.name + ".br"), brotli.compress(data))
+    return int(changed)
+
+
+def publish(path, text, do_minify=True, compress=True):
+    """Minify `text` by file suffix, write it to `path` only if different, then
+    refresh its compressed siblings. Returns True if the page itself changed."""
+    path = Path(path)
+    data = (minify(text, path.suffix) if do_minify else text).encode("utf-8")
+    changed = fileio.write_bytes(path, data)
+    if compress:
+        precompress(path, data)
+    return changed
+
+
+def process_file(path, compress_only=False):
+    """Minify a file in place (unless compress_only) and refresh its siblings."""
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if compress_only:
+        return path, bool(precompress(path, text.encode("utf-8")))
+    return path, publish(path, text)
+
+
+def postprocess(paths, workers=None, compress_only=False):
+    """Run process_file over many files across a process pool. Returns changed paths."""
+    files = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            files += [f for f in sorted(p.rglob("*")) if f.suffix.lower() in SUFFIXES]
+        elif p.suffix.lower() in SUFFIXES:
+            files.append(p)
+    if not files:
+        return []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(process_file, files, [compress_only] * len(files), chunksize=8)
+        return [path for path, changed in results if changed]
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Minify generated HTML/CSS/JS in place and write .gz/.br siblings.")
+    ap.add_argument("paths", nargs="+", help="Files or directories")
+    ap.add_argument("--compress-only", action="store_true", help="Leave sources as-is; only refresh siblings")
+    ap.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = ap.parse_args()
+    changed = postprocess(args.paths, workers=args.workers, compress_only=args.compress_only)
+    for path in changed:
+        print(f"✔️ {path}")
+    print(f"✔️ {len(changed)} file(s) changed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+# python/dispatch/build.py
+# ─────────────────────────────────────────────────────────────────────────────
+# Incremental builder for the dispatch section.
+#
+# Sources are every dispatch/posts/*.html page plus every draft pair in
+# write.DRAFTS_DIR (<base>.json + <base>.html, as written by write.py). A
+# manifest keeps each source's sha256; only changed sources are processed
+# (across a process pool once there are enough of them), and posts.json and
+# the index pages are rewritten only when the post list actually changed.
+#
+#   - a draft whose JSON says "published": true is minified into dispatch/posts/
+#     and its metadata merged into posts.json (keyed by dispatch_url)
+#   - a changed hand-written page is left as-is but gets fresh .gz/.br siblings;
+#     posts.json is never touched for it, so a page stays unlisted until it
+#     gets an entry there (by hand or by publishing it as a draft)
+#   - changed post pages are re-tokenized for the search index (search.py);
+#     term counts of unchanged posts come from the .build/terms.json cache,
+#     and posts missing from it are tokenized before the index is written
+#   - RSS/Atom/JSON feeds and sitemap.xml (feeds.py) are rewritten only when
+#     the posts that contribute to them change
+#
+# Usage (from python/dispatch/, repo root on PYTHONPATH for python.common):
+#   PYTHONPATH=../.. python build.py            # incremental
+#   PYTHONPATH=../.. python build.py --force    # ignore the manifest
+# ─────────────────────────────────────────────────────────────────────────────
+
+import argparse
+import hashlib
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import feeds
+import generate_index
+import search
+from python.common import fileio, minify
+from write import DRAFTS_DIR
+
+DISPATCH_DIR = generate_index.DISPATCH_DIR
+POSTS_DIR = DISPATCH_DIR / "posts"
+POSTS_JSON = generate_index.POSTS_JSON
+MANIFEST = Path(__file__).resolve().parent / ".build" / "manifest.json"
+TERMS_CACHE = MANIFEST.parent / "terms.json"
+DISPATCH_URL = "https://alaskamoves.us/dispatch/posts/{base}.html"
+PARALLEL_MIN = 8   # below this many changed sources, a process pool costs more than it saves
+
+
+def _sha(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part)
+    return h.hexdigest()
+
+
+def scan_sources():
+    """{source key: (kind, path)} for every post page and draft pair."""
+    sources = {}
+    for path in sorted(POSTS_DIR.glob("*.html")):
+        sources[f"posts/{path.name}"] = ("post", path)
+    for path in sorted(DRAFTS_DIR.glob("*.json")):
+        if path.with_suffix(".html").exists():
+            sources[f"drafts/{path.name}"] = ("draft", path)
+    return sources
+
+
+def source_hash(kind, path):
+    if kind == "draft":
+        return _sha(path.read_bytes(), path.with_suffix(".html").read_bytes())
+    return _sha(path.read_bytes())
+
+
+def process_source(kind, path):
+    """Turn one changed source into its post page (drafts only) and metadata.
+    Runs in a worker process, so it only takes and returns plain data."""
+    path = Path(path)
+    base = path.stem
+    if kind == "draft":
+        meta = json.loads(path.read_text(encoding="utf-8"))
+        if not meta.get("published"):
+            return {"kind": kind, "base": base, "meta": None, "page": None, "terms": None}
+        page = path.with_suffix(".html").read_text(encoding="utf-8")
+        return {"kind": kind, "base": base, "meta": meta, "page": page, "terms": search.term_counts(page)}
+    page = path.read_text(encoding="utf-8")
+    minify.precompress(path, page.encode("utf-8"))
+    return {"kind": kind, "base": base, "meta": None, "page": None, "terms": search.term_counts(page)}
+
+
+def _run(jobs, workers):
+    if len(jobs) < PARALLEL_MIN:
+        return [process_source(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(process_source, *zip(*jobs)))
+
+
+def load_manifest():
+    if MANIFEST.exists():
+        try:
+            return json.loads(MANIFEST.read_text())
+        except ValueError:
+            pass
+    return {"sources": {}}
+
+
+def save_manifest(manifest):
+    fileio.write_json(MANIFEST, manifest, sort_keys=True)
+
+
+def update_search(posts, results, force=False):
+    """Refresh cached term counts for processed posts, tokenize any post the
+    cache has never seen (e.g. the first build after the cache was added or
+    lost), and rewrite the index if anything changed. Returns the number of
+    index files written."""
+    cache = {}
+    if TERMS_CACHE.exists() and not force:
+        try:
+            cache = json.loads(TERMS_CACHE.read_text(encoding="utf-8"))
+        except ValueError:
+            cache = {}
+    dirty = force or not (search.SEARCH_DIR / "meta.json").exists()
+    for res in results:
+        if res.get("terms") is not None:
+            cache[res["base"]] = res["terms"]
+            dirty = True
+    for path in sorted(POSTS_DIR.glob("*.html")):
+        if path.stem not in cache:
+            cache[path.stem] = search.term_counts(path.read_text(encoding="utf-8"))
+            dirty = True
+    for base in [b for b in cache if not (POSTS_DIR / f"{b}.html").exists()]:
+        del cache[base]
+        dirty = True
+    if not dirty:
+        return 0
+
+    fileio.write_json(TERMS_CACHE, cache, compact=True)
+    titles = {p.get("dispatch_url"): p.get("title") for p in posts}
+    docs = [(f"posts/{base}.html", titles.get(DISPATCH_URL.format(base=base)) or base, cache[base])
+            for base in sorted(cache)]
+    return search.write_index(docs)
+
+
+def merge_posts(posts, results):
+    """Apply published drafts to the posts.json list. Returns True if it changed."""
+    by_url = {p.get("dispatch_url"): i for i, p in enumerate(posts)}
+    changed = False
+    for res in results:
+        meta = res["meta"]
+        if not meta:
+            continue
+        url = meta.get("dispatch_url") or DISPATCH_URL.format(base=res["base"])
+        if url in by_url:
+            current = posts[by_url[url]]
+            merged = {**current, **meta}
+            if merged != current:
+                posts[by_url[url]] = merged
+                changed = True
+        else:
+            by_url[url] = len(posts)
+            posts.append(meta)
+            changed = True
+    return changed
+
+
+def build(force=False, workers=None, page_size=generate_index.PAGE_SIZE):
+    t0 = time.perf_counter()
+    manifest = {"sources": {}} if force else load_manifest()
+    known = manifest.setdefault("sources", {})
+
+    sources = scan_sources()
+    hashes = {key: source_hash(kind, path) for key, (kind, path) in sources.items()}
+    changed = [key for key in sources if known.get(key) != hashes[key]]
+
+    results = _run([(sources[k][0], str(sources[k][1])) for k in changed], workers)
+
+    for res in results:
+        if res["page"] is not None:
+            out = POSTS_DIR / f"{res['base']}.html"
+            if minify.publish(out, res["page"]):
+                print(f"✔️ published {out.name}")
+            hashes[f"posts/{out.name}"] = source_hash("post", out)
+
+    posts = json.loads(POSTS_JSON.read_text(encoding="utf-8")) if POSTS_JSON.exists() else []
+    posts_changed = merge_posts(posts, results)
+    index_missing = not (DISPATCH_DIR / "index.html").exists()
+    if posts_changed:
+        posts = generate_index.sort_posts(posts)
+        fileio.write_json(POSTS_JSON, posts, ensure_ascii=False)
+    listed = [p for p in generate_index.sort_posts(posts) if p.get("published", True)]
+    if posts_changed or index_missing or force:
+        generate_index.build_index(listed, DISPATCH_DIR, page_size)
+    shards = update_search(posts, results, force)
+    feed_state = {} if force else manifest.setdefault("feeds", {})
+    written_feeds = feeds.write_feeds(listed, generate_index.index_page_names(len(listed), page_size),
+                                      DISPATCH_DIR, feed_state)
+    manifest["feeds"] = feed_state
+
+    manifest["sources"] = {key: hashes[key] for key in hashes if key in sources or key.startswith("posts/")}
+    save_manifest(manifest)
+
+    ms = (time.perf_counter() - t0) * 1000
+    print(f"✔️ dispatch built: {len(changed)} changed source(s), "
+          f"posts.json {'updated' if posts_changed else 'unchanged'}, "
+          f"{shards} search file(s) written, feeds {', '.join(written_feeds) or 'unchanged'}, {ms:.1f} ms")
+    fileio.report("dispatch files")
+    return changed
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Incrementally build dispatch posts, posts.json and the index.")
+    ap.add_argument("--force", action="store_true", help="Ignore the manifest and reprocess every source")
+    ap.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    ap.add_argument("--page-size", type=int, default=generate_index.PAGE_SIZE, help="Posts per index page")
+    args = ap.parse_args()
+    build(force=args.force, workers=args.workers, page_size=args.page_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# python/dispatch/feeds.py
+# ─────────────────────────────────────────────────────────────────────────────
+# RSS 2.0, Atom, JSON Feed and sitemap output for the dispatch section.
+#
+# Everything is streamed from the sorted post metadata: XML goes through
+# XMLGenerator and the JSON Feed is written item by item, each into a temp
+# file that is renamed into place. Each output records a digest of the posts
+# that feed into it in the build manifest and is skipped when that digest is
+# unchanged. The sitemap splits into sitemap-N.xml files plus a sitemap index
+# once it passes the protocol's 50,000 URL / 50 MB limits.
+# ─────────────────────────────────────────────────────────────────────────────
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from xml.sax.saxutils import XMLGenerator
+
+from python.common import fileio
+
+SITE = "https://alaskamoves.us/dispatch/"
+FEED_TITLE = "Dispatch"
+FEED_DESCRIPTION = "selected writings filed in operational order"
+AUTHOR = "Alaska Transportation & Trucking L.L.C."
+FEED_SIZE = 20
+SITEMAP_MAX_URLS = 50_000
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+def _digest(obj):
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _date(post):
+    try:
+        return datetime.strptime(post.get("publish_date") or "", "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _element(xml, name, text=None, attrs=None):
+    xml.startElement(name, attrs or {})
+    if text is not None:
+        xml.characters(str(text))
+    xml.endElement(name)
+
+
+def write_rss(posts, path):
+    with fileio.atomic_open(path) as f:
+        xml = XMLGenerator(f, encoding="utf-8", short_empty_elements=True)
+        xml.startDocument()
+        xml.startElement("rss", {"version": "2.0"})
+        xml.startElement("channel", {})
+        _element(xml, "title", FEED_TITLE)
+        _element(xml, "link", SITE)
+        _element(xml, "description", FEED_DESCRIPTION)
+        for post in posts:
+            xml.startElement("item", {})
+            _element(xml, "title", post.get("title", ""))
+            _element(xml, "link", post.get("dispatch_url", ""))
+            _element(xml, "guid", post.get("dispatch_url", ""), {"isPermaLink": "true"})
+            _element(xml, "pubDate", _date(post).strftime("%a, %d %b %Y %H:%M:%S +0000"))
+            if post.get("excerpt"):
+                _element(xml, "description", post["excerpt"])
+            for tag in post.get("tags") or []:
+                _element(xml, "category", tag)
+            xml.endElement("item")
+        xml.endElement("channel")
+        xml.endElement("rss")
+        xml.endDocument()
+
+
+def write_atom(posts, path):
+    updated = max((_date(p) for p in posts), default=_date({})).isoformat()
+    with fileio.atomic_open(path) as f:
+        xml = XMLGenerator(f, encoding="utf-8", short_empty_elements=True)
+        xml.startDocument()
+        xml.startElement("feed", {"xmlns": "http://www.w3.org/2005/Atom"})
+        _element(xml, "title", FEED_TITLE)
+        _element(xml, "subtitle", FEED_DESCRIPTION)
+        _element(xml, "id", SITE)
+        _element(xml, "link", attrs={"href": SITE})
+        _element(xml, "link", attrs={"rel": "self", "href": SITE + "atom.xml"})
+        _element(xml, "updated", updated)
+        xml.startElement("author", {})
+        _element(xml, "name", AUTHOR)
+        xml.endElement("author")
+        for post in posts:
+            xml.startElement("entry", {})
+            _element(xml, "title", post.get("title", ""))
+            _element(xml, "id", post.get("dispatch_url", ""))
+            _element(xml, "link", attrs={"href": post.get("dispatch_url", "")})
+            _element(xml, "updated", _date(post).isoformat())
+            if post.get("excerpt"):
+                _element(xml, "summary", post["excerpt"])
+            for tag in post.get("tags") or []:
+                _element(xml, "category", attrs={"term": tag})
+            xml.endElement("entry")
+        xml.endElement("feed")
+        xml.endDocument()
+
+
+def write_json_feed(posts, path):
+    head = {
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": FEED_TITLE,
+        "home_page_url": SITE,
+        "feed_url": SITE + "feed.json",
+        "description": FEED_DESCRIPTION,
+        "authors": [{"name": AUTHOR}],
+    }
+    with fileio.atomic_open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(head, ensure_ascii=False)[:-1] + ', "items": [')
+        for i, post in enumerate(posts):
+            item = {
+                "id": post.get("dispatch_url", ""),
+                "url": post.get("dispatch_url", ""),
+                "title": post.get("title", ""),
+                "summary": post.get("excerpt") or None,
+                "date_published": _date(post).isoformat(),
+                "tags": post.get("tags") or None,
+            }
+            f.write(("," if i else "") + "\n  " + json.dumps({k: v for k, v in item.items() if v is not None},
+                                                          ensure_ascii=False))
+        f.write("\n]}\n")
+
+
+def _sitemap_urls(posts, index_pages):
+    for name in index_pages:
+        yield SITE + ("" if name == "index.html" else name), None
+    for post in posts:
+        yield post.get("dispatch_url", ""), post.get("publish_date") or None
+
+
+def write_sitemaps(posts, index_pages, out_dir):
+    """Stream <url> entries, rolling to a new sitemap-N.xml at the size limits.
+    A single file is written as sitemap.xml; several get a sitemap index there."""
+    out_dir = Path(out_dir)
+    files = []
+    state = {}
+
+    def open_part():
+        path = out_dir / f".sitemap-{len(files) + 1}.part"
+        f = open(path, "wb")
+        xml = XMLGenerator(f, encoding="utf-8", short_empty_elements=True)
+        xml.startDocument()
+        xml.startElement("urlset", {"xmlns": SITEMAP_NS})
+        files.append(path)
+        state.update(f=f, xml=xml, urls=0)
+
+    def close_part():
+        state["xml"].endElement("urlset")
+        state["xml"].endDocument()
+        state["f"].close()
+
+    open_part()
+    for loc, lastmod in _sitemap_urls(posts, index_pages):
+        # 200 bytes of headroom for the closing tag and one more entry.
+        if state["urls"] >= SITEMAP_MAX_URLS or state["f"].tell() >= SITEMAP_MAX_BYTES - 200 - len(loc):
+            close_part()
+            open_part()
+        state["xml"].startElement("url", {})
+        _element(state["xml"], "loc", loc)
+        if lastmod:
+            _element(state["xml"], "lastmod", lastmod)
+        state["xml"].endElement("url")
+        state["urls"] += 1
+    close_part()
+
+    for stale in out_dir.glob("sitemap-*.xml"):
+        stale.unlink()
+    if len(files) == 1:
+        os.replace(files[0], out_dir / "sitemap.xml")
+        return 1
+    for i, part in enumerate(files, 1):
+        os.replace(part, out_dir / f"sitemap-{i}.xml")
+    with fileio.atomic_open(out_dir / "sitemap.xml") as f:
+        xml = XMLGenerator(f, encoding="utf-8", short_empty_elements=True)
+        xml.startDocument()
+        xml.startElement("sitemapindex", {"xmlns": SITEMAP_NS})
+        for i in range(1, len(files) + 1):
+            xml.startElement("sitemap", {})
+            _element(xml, "loc", f"{SITE}sitemap-{i}.xml")
+            xml.endElement("sitemap")
+        xml.endElement("sitemapindex")
+        xml.endDocument()
+    return len(files)
+
+
+def write_feeds(posts, index_pages, out_dir, state):
+    """Rewrite each feed whose contributing posts changed. `posts` must already be
+    sorted newest first; `state` is the manifest's {output: digest} map, updated
+    in place. Returns the names of the outputs written."""
+    out_dir = Path(out_dir)
+    latest = posts[:FEED_SIZE]
+    jobs = {
+        "feed.xml": (latest, lambda: write_rss(latest, out_dir / "feed.xml")),
+        "atom.xml": (latest, lambda: write_atom(latest, out_dir / "atom.xml")),
+        "feed.json": (latest, lambda: write_json_feed(latest, out_dir / "feed.json")),
+        "sitemap.xml": ([[p.get("dispatch_url"), p.get("publish_date")] for p in posts] + list(index_pages),
+                        lambda: write_sitemaps(posts, index_pages, out_dir)),
+    }
+    written = []
+    for name, (contributing, write) in jobs.items():
+        digest = _digest(contributing)
+        if state.get(name) == digest and (out_dir / name).exists():
+            continue
+        write()
+        state[name] = digest
+        written.append(name)
+    return written
@@ -1,74 +1,109 @@
+# python/dispatch/generate_index.py
+# ─────────────────────────────────────────────────────────────────────────────
+# Renders dispatch/index.html (and index-2.html, index-3.html, ... once the
+# post count passes PAGE_SIZE) from dispatch/db/posts.json.
+# Templates live in templates/ and go through one Jinja2 Environment with a
+# bytecode cache, so a warm process (or the next run) skips recompiling them.
+# Pages are minified and get .gz/.br siblings; unchanged pages aren't rewritten.
+#
+# Usage (from python/dispatch/, repo root on PYTHONPATH):
+#   PYTHONPATH=../.. python generate_index.py
+# ─────────────────────────────────────────────────────────────────────────────
+
+import argparse
 import json
-from datetime import datetime
-from jinja2 import Template
-
-# Load posts.json
-with open("../../dispatch/db/posts.json", "r") as f:
-    posts = json.load(f)
-
-# Sort posts by publish_date descending
-def parse_date(post):
-    try:
-        return datetime.strptime(post["publish_date"], "%Y-%m-%d")
-    except ValueError:
-        return datetime.min
-
-posts.sort(key=parse_date, reverse=True)
-
-# HTML template with inline [medium] citation
-html_template = """<!DOCTYPE html>
-<html lang="en">
-<head>
-  <meta charset="UTF-8">
-  <title>Dispatch</title>
-  <link rel="stylesheet" href="dispatch.styles">
-</head>
-<body>
-<div class="container">
-  <h1>../dispatch/</h1>
-  <p><em>selected writings filed in operational order</em></p>
-
-  <div class="links">
-    {% for post in posts %}
-    <li>
-        <a href="{{ post.dispatch_url | replace('https://alaskamoves.us/dispatch/', '') }}" target="_self">
-          {{ post.title }}
-        </a>
-        <div class="mirror-links">
-            {% if post.medium_url %}
-                <a href="{{ post.medium_url }}" target="_self">[MEDIUM]</a>
-            {% endif %}
-            {% if post.substack_url %}
-                <a href="{{ post.substack_url }}" target="_self">[SUBSTACK]</a>
-            {% endif %}
-        </div>
-    </li>
-    {% endfor %}
-  </div>
-
-  <div class="footer-nav" style="margin-top: 2rem;">
-    <a href="https://alaskamoves.us/index.html" target="_self" rel="noopener noreferrer">return.(self) ↩︎</a>
-  </div>
-</div>
-
-<footer class="site-footer">
-    &copy; 2025 Alaska Transportation &amp; Trucking L.L.C.
-    <nav class="footer-nav">
-        <a href="https://alaskamoves.us/index.html">onlyCrumbs</a>
-        <a href="https://alaskamoves.us/index.html">pricing</a>
-        <a href="https://alaskamoves.us/index.html">dispatch</a>
-    </nav>
-</footer>
-  
-</body>
-</html>"""
-
-# Render HTML
-template = Template(html_template)
-rendered_html = template.render(posts=posts)
-
-# Save to index.html
-with open("../../dispatch/index.html", "w", encoding="utf-8") as f:
-    f.write(rendered_html)
-
-print("✔️ index.html generated successfully.")
\ No newline at end of file
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from python.common import minify
+
+DISPATCH_DIR = Path("../../dispatch")
+POSTS_JSON = DISPATCH_DIR / "db" / "posts.json"
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+CACHE_DIR = Path(__file__).resolve().parent / ".jinja_cache"
+PAGE_SIZE = 50
+
+ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+@lru_cache(maxsize=None)
+def get_env() -> Environment:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    return Environment(
+        loader=FileSystemLoader(str(TEMPLATE_DIR)),
+        bytecode_cache=FileSystemBytecodeCache(str(CACHE_DIR)),
+        auto_reload=False,
+    )
+
+
+def sort_key(post):
+    """ISO dates sort correctly as strings; anything malformed sinks to the end."""
+    d = post.get("publish_date") or ""
+    return d if ISO_DATE.fullmatch(d) else ""
+
+
+def sort_posts(posts):
+    # Newest first; ties keep their posts.json order.
+    return sorted(posts, key=sort_key, reverse=True)
+
+
+def page_name(number):
+    return "index.html" if number == 1 else f"index-{number}.html"
+
+
+def _page_size(n_posts, page_size):
+    return page_size if page_size and page_size > 0 else max(n_posts, 1)
+
+
+def index_page_names(n_posts, page_size=PAGE_SIZE):
+    size = _page_size(n_posts, page_size)
+    return [page_name(i) for i in range(1, max(1, -(-n_posts // size)) + 1)]
+
+
+def render_index_pages(posts, page_size=PAGE_SIZE):
+    """Yield (filename, html) for each index page of already-sorted posts."""
+    template = get_env().get_template("index.html")
+    size = _page_size(len(posts), page_size)
+    count = len(index_page_names(len(posts), page_size))
+    for number in range(1, count + 1):
+        page = {
+            "number": number,
+            "count": count,
+            "prev": page_name(number - 1) if number > 1 else None,
+            "next": page_name(number + 1) if number < count else None,
+        }
+        chunk = posts[(number - 1) * size:number * size]
+        yield page_name(number), template.render(posts=chunk, page=page)
+
+
+def build_index(posts, out_dir=DISPATCH_DIR, page_size=PAGE_SIZE):
+    """Publish every index page; returns the paths whose bytes changed."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for name, html in render_index_pages(sort_posts(posts), page_size):
+        path = out_dir / name
+        if minify.publish(path, html):
+            written.append(path)
+    return written
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Render the dispatch index page(s) from posts.json.")
+    ap.add_argument("--posts", default=str(POSTS_JSON), help=f"posts.json path (default: {POSTS_JSON})")
+    ap.add_argument("--out-dir", default=str(DISPATCH_DIR), help=f"Output directory (default: {DISPATCH_DIR})")
+    ap.add_argument("--page-size", type=int, default=PAGE_SIZE, help=f"Posts per index page, 0 = one page (default: {PAGE_SIZE})")
+    args = ap.parse_args()
+
+    with open(args.posts, "r", encoding="utf-8") as f:
+        posts = json.load(f)
+
+    written = build_index(posts, args.out_dir, args.page_size)
+    print(f"✔️ {len(written)} index page(s) generated successfully.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# python/dispatch/search.py
+# ─────────────────────────────────────────────────────────────────────────────
+# Prebuilt full-text index for dispatch posts, so dispatch/search.js can answer
+# a query by fetching meta.json plus one small shard per query term.
+#
+# Layout (dispatch/search/):
+#   meta.json      {"version", "N", "avgdl", "scale", "docs": [[url, title], ...],
+#                   "shards": [prefix, ...]}
+#   <prefix>.bin   terms sharing their first two characters, sorted; each is
+#                    varint(len) term-utf8 varint(df) then df x
+#                    (varint(doc-id gap), varint(round(bm25 * scale)))
+#
+# Term counts per post are cached by build.py, so only changed posts are
+# re-tokenized. BM25 weights depend on N and avgdl, so adding a post can touch
+# every shard; shards whose bytes didn't change are left alone.
+# ─────────────────────────────────────────────────────────────────────────────
+
+import html as _html
+import math
+import re
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from python.common import fileio
+
+SEARCH_DIR = Path("../../dispatch/search")
+K1, B = 1.2, 0.75
+SCALE = 100          # weights are stored as integer hundredths
+PREFIX_LEN = 2
+
+STRIP_RE = re.compile(r"<(script|style)\b.*?</\1>|<!--.*?-->", re.S | re.I)
+TAG_RE = re.compile(r"<[^>]+>")
+WORD_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have he her his i in is it its of on or
+our so that the their them they this to was we were what when which who will with
+you your not no do does did than then there these those into out up if just can
+""".split())
+
+
+def tokenize(text):
+    return [w for w in WORD_RE.findall(text.lower()) if len(w) > 1 and w not in STOPWORDS]
+
+
+def term_counts(page):
+    """{"len": token count, "tf": {term: count}} for one post page's visible text."""
+    body = page.split("<body", 1)[-1]
+    text = _html.unescape(TAG_RE.sub(" ", STRIP_RE.sub(" ", body)))
+    tokens = tokenize(text)
+    return {"len": len(tokens), "tf": dict(Counter(tokens))}
+
+
+def _varint(n, out):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def build_shards(docs):
+    """docs: [(url, title, counts)] in doc-id order. Returns (meta, {prefix: bytes})."""
+    n = len(docs)
+    avgdl = sum(c["len"] for _, _, c in docs) / n if n else 0.0
+    postings = defaultdict(list)
+    for doc_id, (_, _, counts) in enumerate(docs):
+        for term, tf in counts["tf"].items():
+            postings[term].append((doc_id, tf))
+
+    shards = defaultdict(bytearray)
+    for term in sorted(postings):
+        plist = postings[term]
+        df = len(plist)
+        idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+        out = shards[term[:PREFIX_LEN]]
+        encoded = term.encode("utf-8")
+        _varint(len(encoded), out)
+        out += encoded
+        _varint(df, out)
+        prev = 0
+        for doc_id, tf in plist:
+            dl = docs[doc_id][2]["len"]
+            w = idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * dl / avgdl))
+            _varint(doc_id - prev, out)
+            _varint(max(1, round(w * SCALE)), out)
+            prev = doc_id
+
+    meta = {
+        "version": 1,
+        "N": n,
+        "avgdl": round(avgdl, 3),
+        "scale": SCALE,
+        "prefixLen": PREFIX_LEN,
+        "docs": [[url, title] for url, title, _ in docs],
+        "shards": sorted(shards),
+    }
+    return meta, {prefix: bytes(data) for prefix, data in shards.items()}
+
+
+def write_index(docs, out_dir=SEARCH_DIR):
+    """Write meta.json and the shards, skipping files whose bytes are unchanged
+    and removing shards that no longer exist. Returns the number of files written."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    meta, shards = build_shards(docs)
+    files = {f"{prefix}.bin": data for prefix, data in shards.items()}
+    files["meta.json"] = fileio.dumps_json(meta, compact=True)
+
+    written = sum(fileio.write_bytes(out_dir / name, data) for name, data in files.items())
+    for stale in out_dir.glob("*.bin"):
+        if stale.name not in files:
+            stale.unlink()
+    return written
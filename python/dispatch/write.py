@@ -21,11 +21,12 @@ It carries the outline of what was risked by speaking at all.
 ─────────────────────────────────────────────────────────────────────
 """
 
-import json
 from pathlib import Path
 import datetime
 import re
 
+from python.common import fileio
+
 # === CONFIGURATION ===
 TITLE = "Why This Page Leaves Titles"
 SUBTITLE = "Not untitled, just unclaimed."
@@ -70,53 +71,65 @@ DESCRIPTION = SUBTITLE
 PUBLISHED = False
 # =======================
 
-# Paths and metadata
-DRAFTS_DIR = Path("../python/dispatch/drafts/")
-DRAFTS_DIR.mkdir(parents=True, exist_ok=True)
-slug = re.sub(r'[^a-z0-9]+', '-', TITLE.lower()).strip('-')
-date = datetime.date.today().strftime("%Y-%m-%d")
-yyyymmdd = date.replace("-", "")
-filename_base = f"{yyyymmdd}-{slug}"
-html_path = DRAFTS_DIR / f"{filename_base}.html"
-json_path = DRAFTS_DIR / f"{filename_base}.json"
-
-dispatch_url = f"https://alaskamoves.us/dispatch/posts/{filename_base}.html"
-medium_url = f"https://medium.alaskamoves.us/{slug}"
-substack_url = f"https://alaskamoves.substack.com/p/{slug}"
-
-# HTML content
-html = f"""<!DOCTYPE html>
+# Paths and metadata (build.py reads drafts from here too)
+DRAFTS_DIR = Path(__file__).resolve().parent / "drafts"
+
+
+def slugify(title):
+    return re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')
+
+
+def render_draft(title, subtitle, body, date):
+    return f"""<!DOCTYPE html>
 <html lang="en">
 <head>
   <meta charset="UTF-8">
-  <title>{TITLE}</title>
+  <title>{title}</title>
   <link rel="stylesheet" href="https://alaskamoves.us/styles/css/dispatch.css">
 </head>
 <body>
-  <h1>{TITLE}</h1>
-  <h3>{SUBTITLE}</h3>
+  <h1>{title}</h1>
+  <h3>{subtitle}</h3>
   <p>Published: {date}</p>
   <hr />
-  {BODY}
+  {body}
 </body>
 </html>"""
 
-# JSON metadata
-metadata = {
-    "title": TITLE,
-    "slug": slug,
-    "publish_date": date,
-    "medium_url": medium_url,
-    "dispatch_url": dispatch_url,
-    "excerpt": DESCRIPTION,
-    "tags": TAGS,
-    "substack_url": substack_url,
-    "published": PUBLISHED
-}
-
-# Ensure directory and write both files
-DRAFTS_DIR.mkdir(parents=True, exist_ok=True)
-html_path.write_text(html, encoding="utf-8")
-json_path.write_text(json.dumps(metadata, indent=2), encoding="utf-8")
-
-filename_base  # Return base name for visibility in UI
\ No newline at end of file
+
+def write_draft(title=TITLE, subtitle=SUBTITLE, body=BODY, tags=TAGS, description=DESCRIPTION,
+                published=PUBLISHED, drafts_dir=DRAFTS_DIR):
+    """Write a <yyyymmdd>-<slug>.html/.json pair into drafts_dir. Flip `published`
+    (here or in the JSON) and run build.py to move it into dispatch/posts/."""
+    slug = slugify(title)
+    date = datetime.date.today().strftime("%Y-%m-%d")
+    yyyymmdd = date.replace("-", "")
+    filename_base = f"{yyyymmdd}-{slug}"
+    html_path = drafts_dir / f"{filename_base}.html"
+    json_path = drafts_dir / f"{filename_base}.json"
+
+    dispatch_url = f"https://alaskamoves.us/dispatch/posts/{filename_base}.html"
+    medium_url = f"https://medium.alaskamoves.us/{slug}"
+    substack_url = f"https://alaskamoves.substack.com/p/{slug}"
+
+    # JSON metadata
+    metadata = {
+        "title": title,
+        "slug": slug,
+        "publish_date": date,
+        "medium_url": medium_url,
+        "dispatch_url": dispatch_url,
+        "excerpt": description,
+        "tags": tags,
+        "substack_url": substack_url,
+        "published": published
+    }
+
+    # Write both files (atomically; directories are created as needed)
+    fileio.write_text(html_path, render_draft(title, subtitle, body, date))
+    fileio.write_json(json_path, metadata)
+    return filename_base
+
+
+if __name__ == "__main__":
+    print(write_draft())  # Return base name for visibility in UI
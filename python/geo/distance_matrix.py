@@ -0,0 +1,155 @@
+# python/geo/distance_matrix.py
+# ─────────────────────────────────────────────────────────────────────────────
+# Precomputed all-pairs crow-flies distances for the service area: every ZIP
+# within MAX_MILES of the FOB, quantized to uint16 tenths of a mile.
+#
+#   geo/db/distance_matrix.u16    N x N little-endian uint16, row-major
+#   geo/db/distance_matrix.json   {"zips": [...], "scale": 10, "fob", "radius",
+#                                  "source_sha256"}
+#
+# The matrix is memory-mapped read-only, so every process shares the OS page
+# cache instead of loading its own copy, and a lookup is two dict hits plus
+# one array read. Reading needs only the stdlib (mmap + memoryview); building
+# uses NumPy. The build is skipped when the geo shards haven't changed.
+#
+# Usage (from python/geo/, repo root on PYTHONPATH):
+#   PYTHONPATH=../.. python distance_matrix.py            # build if stale
+#   PYTHONPATH=../.. python distance_matrix.py --force
+# ─────────────────────────────────────────────────────────────────────────────
+
+import hashlib
+import json
+import mmap
+import struct
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from python.common import fileio
+
+DB_DIR = Path("../../geo/db")
+MATRIX_FILE = DB_DIR / "distance_matrix.u16"
+INDEX_FILE = DB_DIR / "distance_matrix.json"
+SCALE = 10                # tenths of a mile
+MAX_CELL = 0xFFFF
+BLOCK_ROWS = 512          # rows computed per NumPy block while building
+
+
+def _shards(db_dir):
+    return sorted(Path(db_dir).glob("[0-9][0-9].json"))
+
+
+def source_hash(db_dir=DB_DIR):
+    h = hashlib.sha256()
+    for path in _shards(db_dir):
+        h.update(path.name.encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def service_area(db_dir, fob_zip, radius):
+    """(zips, lats, lons) for every ZIP within `radius` miles of `fob_zip`, sorted."""
+    from python.geo.ziptable import load_table
+    table = load_table(Path(db_dir))
+    fob = table.get(fob_zip)
+    if fob is None or fob.lat is None or fob.lon is None:
+        raise ValueError(f"FOB ZIP {fob_zip} not found in {db_dir}")
+    rows = table.within(fob.lat, fob.lon, radius)
+    lats, lons = table.columns("lat", "lon")
+    return table.zipcodes(rows), lats[rows].tolist(), lons[rows].tolist()
+
+
+def build(db_dir=DB_DIR, matrix_path=MATRIX_FILE, index_path=INDEX_FILE, fob_zip=None, radius=None, force=False):
+    """Write the matrix and its index unless the shards are unchanged. Returns N
+    (the number of ZIPs), or None if nothing needed rebuilding."""
+    import numpy as np
+    from python.geo.logistics import EARTH_RADIUS_MI, FOB_ZIP, MAX_MILES
+
+    fob_zip = fob_zip or FOB_ZIP
+    radius = MAX_MILES if radius is None else radius
+    digest = source_hash(db_dir)
+    if not force and Path(index_path).exists() and Path(matrix_path).exists():
+        with open(index_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if (meta.get("source_sha256"), meta.get("fob"), meta.get("radius")) == (digest, fob_zip, radius):
+            return None
+
+    zips, lats, lons = service_area(db_dir, fob_zip, radius)
+    lat = np.radians(np.asarray(lats))
+    lon = np.radians(np.asarray(lons))
+    cos_lat = np.cos(lat)
+    with fileio.atomic_open(matrix_path, "wb") as f:
+        for start in range(0, len(zips), BLOCK_ROWS):
+            rows = slice(start, start + BLOCK_ROWS)
+            dlat = lat[None, :] - lat[rows, None]
+            dlon = lon[None, :] - lon[rows, None]
+            a = np.sin(dlat / 2) ** 2 + cos_lat[rows, None] * cos_lat[None, :] * np.sin(dlon / 2) ** 2
+            miles = 2 * EARTH_RADIUS_MI * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+            f.write(np.clip(np.rint(miles * SCALE), 0, MAX_CELL).astype("<u2").tobytes())
+    fileio.write_json(index_path, {"fob": fob_zip, "radius": radius, "scale": SCALE,
+                                   "source_sha256": digest, "zips": zips})
+    load_matrix.cache_clear()
+    return len(zips)
+
+
+class DistanceMatrix:
+    """Read-only, memory-mapped view of a built matrix."""
+
+    def __init__(self, matrix_path=MATRIX_FILE, index_path=INDEX_FILE):
+        with open(index_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.zips = meta["zips"]
+        self.row = {z: i for i, z in enumerate(self.zips)}
+        self.n = len(self.zips)
+        self.scale = meta.get("scale", SCALE)
+        self.fob = meta.get("fob")
+        self.radius = meta.get("radius")
+        with open(matrix_path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) != self.n * self.n * 2:
+            raise ValueError(f"{matrix_path} does not match {index_path}; rebuild it")
+        # The file is little-endian; only big-endian hosts pay for struct.
+        self._cells = memoryview(self._mm).cast("H") if sys.byteorder == "little" else None
+
+    def miles(self, zip1, zip2):
+        """Distance in miles (to 0.1 mi), or None if either ZIP is outside the matrix."""
+        i, j = self.row.get(zip1), self.row.get(zip2)
+        if i is None or j is None:
+            return None
+        k = i * self.n + j
+        cell = self._cells[k] if self._cells is not None else struct.unpack_from("<H", self._mm, 2 * k)[0]
+        return cell / self.scale
+
+
+@lru_cache(maxsize=None)
+def load_matrix(matrix_path=MATRIX_FILE, index_path=INDEX_FILE):
+    """The shared matrix, or None if it hasn't been built (callers fall back)."""
+    try:
+        return DistanceMatrix(matrix_path, index_path)
+    except (OSError, ValueError):
+        return None
+
+
+def lookup(zip1, zip2):
+    matrix = load_matrix()
+    return matrix.miles(zip1, zip2) if matrix is not None else None
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Precompute the service-area ZIP distance matrix.")
+    ap.add_argument("--radius", type=float, default=None, help="Miles from the FOB to include (default: MAX_MILES)")
+    ap.add_argument("--force", action="store_true", help="Rebuild even if the geo shards are unchanged")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    n = build(radius=args.radius, force=args.force)
+    if n is None:
+        print(f"✅ distance matrix up to date: {MATRIX_FILE}")
+    else:
+        print(f"✅ {n} ZIPs, {n * n * 2:,} bytes written to {MATRIX_FILE} ({time.perf_counter() - t0:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# python/geo/gas_prices.py
+# ─────────────────────────────────────────────────────────────────────────────
+# Gas prices over time, kept beside the geo shards instead of inside them.
+#
+#   geo/db/gas_prices.log    append-only CSV lines: timestamp,zipcode,price
+#                            (ISO 8601; naive times are UTC)
+#   geo/db/gas_prices.json   compacted snapshot {"series": {zip: [[epoch, price],
+#                            ...]}} sorted by time
+#
+# A price update is one appended line, so the shards are never rewritten.
+# Once the log passes COMPACT_BYTES, record() folds it into the snapshot and
+# trims what it folded. Appends and compactions hold an exclusive flock on
+# gas_prices.log.lock, so concurrent writers (processes included) neither
+# lose lines nor compact over each other; where fcntl is unavailable, keep
+# to one writer at a time. Compaction replaces the snapshot before the log,
+# and readers read the log before the snapshot, so a reader racing a
+# compaction sees every price at least once and needs no lock; a (zip, time)
+# pair keeps one price, so seeing a line twice is harmless. Readers are
+# rebuilt only when either file changes and answer price_as_of with one
+# bisect over that ZIP's series. The shard's gas_price stands in for ZIPs
+# with no history.
+#
+# Usage (from python/geo/, repo root on PYTHONPATH):
+#   PYTHONPATH=../.. python gas_prices.py 44070 2.99    # record now
+#   PYTHONPATH=../.. python gas_prices.py 44070 --as-of 2026-03-01T08:00
+#   PYTHONPATH=../.. python gas_prices.py --compact
+# ─────────────────────────────────────────────────────────────────────────────
+
+import json
+import os
+from bisect import bisect_right
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+
+from python.common import fileio
+
+try:
+    import fcntl  # optional (POSIX advisory locks; without it, run one writer at a time)
+except Exception:
+    fcntl = None
+
+DB_DIR = Path("../../geo/db")
+LOG_FILE = DB_DIR / "gas_prices.log"
+SNAPSHOT_FILE = DB_DIR / "gas_prices.json"
+COMPACT_BYTES = 1 << 20
+
+
+def _epoch(when):
+    """Seconds since the epoch for a datetime, ISO string or number (None = now)."""
+    if when is None:
+        return datetime.now(timezone.utc).timestamp()
+    if isinstance(when, (int, float)):
+        return float(when)
+    if isinstance(when, str):
+        when = datetime.fromisoformat(when)
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.timestamp()
+
+
+def _read_log(log_path):
+    """([(epoch, zip, price), ...], bytes read). A torn last line is left for later."""
+    try:
+        with open(log_path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return [], 0
+    end = data.rfind(b"\n") + 1
+    entries = []
+    for line in data[:end].decode("utf-8").splitlines():
+        try:
+            stamp, zipcode, price = line.split(",")
+            entries.append((_epoch(stamp), zipcode, float(price)))
+        except ValueError:
+            continue
+    return entries, end
+
+
+def _read_snapshot(snapshot_path):
+    try:
+        with open(snapshot_path, "r", encoding="utf-8") as f:
+            return json.load(f).get("series", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def _merge(series, entries):
+    """{zip: ([epochs], [prices])} from snapshot series plus log entries."""
+    merged = {z: dict(points) for z, points in ((z, map(tuple, pts)) for z, pts in series.items())}
+    for t, zipcode, price in entries:
+        merged.setdefault(zipcode, {})[t] = price
+    out = {}
+    for zipcode, points in merged.items():
+        stamps = sorted(points)
+        out[zipcode] = (stamps, [points[t] for t in stamps])
+    return out
+
+
+@contextmanager
+def _writer_lock(log_path):
+    """Exclusive lock on the log's sidecar .lock file, released on exit."""
+    lock_path = Path(str(log_path) + ".lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+def record(zipcode, price, when=None, log_path=LOG_FILE, snapshot_path=SNAPSHOT_FILE):
+    """Append a price observation; compacts once the log passes COMPACT_BYTES."""
+    stamp = datetime.fromtimestamp(_epoch(when), timezone.utc).isoformat(timespec="seconds")
+    line = f"{stamp},{zipcode},{float(price)}\n".encode("utf-8")
+    with _writer_lock(log_path):
+        with open(log_path, "ab") as f:
+            f.write(line)
+            size = f.tell()
+        if size >= COMPACT_BYTES:
+            _compact(log_path, snapshot_path)
+
+
+def compact(log_path=LOG_FILE, snapshot_path=SNAPSHOT_FILE):
+    """Fold the log into the snapshot and drop the folded lines. Returns the
+    number of log entries folded."""
+    with _writer_lock(log_path):
+        return _compact(log_path, snapshot_path)
+
+
+def _compact(log_path, snapshot_path):
+    """compact() for a caller already holding the writer lock."""
+    entries, consumed = _read_log(log_path)
+    if not entries and consumed == 0:
+        return 0
+    merged = _merge(_read_snapshot(snapshot_path), entries)
+    fileio.write_json(snapshot_path, {
+        "series": {z: [[t, p] for t, p in zip(*merged[z])] for z in sorted(merged)},
+    }, compact=True)
+    # Writers are locked out, so only a torn line from a crashed writer can
+    # follow `consumed`; keep it. A crash before this replace just means the
+    # same lines get folded again next time.
+    with fileio.atomic_open(log_path, "wb") as out, open(log_path, "rb") as f:
+        f.seek(consumed)
+        out.write(f.read())
+    return len(entries)
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+@lru_cache(maxsize=4)
+def _load(log_path, snapshot_path, log_stamp, snapshot_stamp):
+    # Log first, then snapshot: see the header for why that needs no lock.
+    entries, _ = _read_log(log_path)
+    return _merge(_read_snapshot(snapshot_path), entries)
+
+
+def load_series(log_path=LOG_FILE, snapshot_path=SNAPSHOT_FILE):
+    """{zip: ([epochs], [prices])}, re-read only when either file has changed."""
+    return _load(str(log_path), str(snapshot_path), _stamp(log_path), _stamp(snapshot_path))
+
+
+def price_as_of(zipcode, when=None, fallback=True):
+    """Price in effect at `zipcode` at `when` (None = now): the latest recorded at
+    or before then. Without history, the shard's gas_price if `fallback`, else None."""
+    series = load_series().get(zipcode)
+    if series is not None:
+        stamps, prices = series
+        i = bisect_right(stamps, _epoch(when))
+        if i:
+            return prices[i - 1]
+    if not fallback:
+        return None
+    from python.geo.ziptable import load_table
+    row = load_table(DB_DIR).get(zipcode)
+    return row.gas_price if row is not None else None
+
+
+def history(zipcode):
+    """[(datetime, price), ...] for `zipcode`, oldest first."""
+    stamps, prices = load_series().get(zipcode, ([], []))
+    return [(datetime.fromtimestamp(t, timezone.utc), p) for t, p in zip(stamps, prices)]
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Record or look up gas prices in the overlay log.")
+    ap.add_argument("zipcode", nargs="?")
+    ap.add_argument("price", nargs="?", type=float, help="Record this price (omit to look one up)")
+    ap.add_argument("--at", help="Timestamp for the recorded price (default: now)")
+    ap.add_argument("--as-of", help="Look up the price in effect at this time (default: now)")
+    ap.add_argument("--compact", action="store_true", help="Fold the log into the snapshot")
+    args = ap.parse_args()
+
+    if args.zipcode and args.price is not None:
+        record(args.zipcode, args.price, args.at)
+        print(f"✅ {args.zipcode}: gas_price = {args.price} at {args.at or 'now'}")
+    elif args.zipcode:
+        print(f"⛽ {args.zipcode} as of {args.as_of or 'now'}: {price_as_of(args.zipcode, args.as_of)}")
+    if args.compact:
+        print(f"✅ folded {compact()} log entries into {SNAPSHOT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,8 +10,8 @@
 # ─────────────────────────────────────────────────────────────────────────────
 import math
 from pathlib import Path
-import json
 from math import radians, sin, cos, sqrt, atan2
+from python.geo import distance_matrix, speed_profile, ziptable
 
 # ─── Global Operational Constants ─────────────────────────────────────────────
 FOB_ZIP = "44107"         # Your Forward Operating Base. Your garage. Your home.
@@ -35,16 +35,14 @@ MIN_MARGIN_PER_GIG = 5.00                            # Don't lift for less
 # ─── ZIP Code Utilities ───────────────────────────────────────────────────────
 def load_zip(zipcode):
     """
-    Load a ZIP code's metadata. Looks it up based on prefix, cracks open the JSON,
-    and returns its entry like a CIA agent flipping through dossiers.
+    Load a ZIP code's metadata. Every shard is read once into the column store
+    (ziptable.py); after that it's a bisect, returning a read-only row that
+    answers entry["lat"] like the old dicts did. Flipping dossiers, faster.
     """
-    path = DB_DIR / f"{zipcode[:2]}.json"
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    for entry in data:
-        if entry.get("zipcode") == zipcode:
-            return entry
-    raise ValueError(f"ZIP {zipcode} not found in {path}")
+    entry = ziptable.load_table(DB_DIR).get(zipcode)
+    if entry is None:
+        raise ValueError(f"ZIP {zipcode} not found in {DB_DIR}")
+    return entry
 
 def haversine(lat1, lon1, lat2, lon2):
     """
@@ -59,29 +57,61 @@ def lookup_distance(zip1, zip2):
     """
     Returns the distance (in miles) between two ZIPs.
     Assumes ZIPs have valid lat/lon fields. No tolls. No traffic. Just vibes.
+    Inside the service area it's two lookups in the prebuilt matrix (to 0.1 mi);
+    anywhere else it's haversine from the shards.
     """
+    miles = distance_matrix.lookup(zip1, zip2)
+    if miles is not None:
+        return miles
     z1 = load_zip(zip1)
     z2 = load_zip(zip2)
     return round(haversine(z1["lat"], z1["lon"], z2["lat"], z2["lon"]), 2)
 
 # ─── Core Evaluation Logic ────────────────────────────────────────────────────
-def estimate_cost(zip1, zip2, fuel_rate=FUEL_RATE, mpg=MPG, load_multiplier=LOAD_MULTIPLIER):
+def estimate_cost(zip1, zip2, fuel_rate=FUEL_RATE, mpg=MPG, load_multiplier=LOAD_MULTIPLIER, depart=None):
     """
     Calculate fuel cost for a single-leg trip from zip1 to zip2.
     Assumes you're not flooring it, but also not hypermiling like a coward.
+    Pass `depart` (datetime or ISO string) to price the hours at that time of week.
     """
     miles = lookup_distance(zip1, zip2)
+    hours = estimate_hours(miles, depart=depart, origin=zip1)
+    return cost_for_miles(miles, fuel_rate, mpg, load_multiplier, hours=hours)
+
+def cost_for_miles(miles, fuel_rate=FUEL_RATE, mpg=MPG, load_multiplier=LOAD_MULTIPLIER, hours=None):
+    """
+    The money side of estimate_cost, for when you already know the miles.
+    Fuel plus a margin per (rounded-up) hour on the road, scaled by the load.
+    """
     gallons = miles / mpg
-    labour = MIN_MARGIN_PER_GIG * estimate_hours(miles)
+    labour = MIN_MARGIN_PER_GIG * (estimate_hours(miles) if hours is None else hours)
     return round(((gallons * fuel_rate + labour) * load_multiplier), 2)
 
-def estimate_hours(miles: float, mph: int = AVG_SPEED) -> int:
+def estimate_hours(miles: float, mph: int = AVG_SPEED, depart=None, origin=None) -> int:
     """
     Estimate driving time in whole hours, conservatively.
     Rounds up to ensure slack for traffic and gig handling.
+    With a `depart` time, mph is scaled by the hour-of-week profile of the
+    origin ZIP's zone (speed_profile.py) — rush hour is slower, 2 am isn't.
     """
+    if depart is not None:
+        mph = mph * speed_profile.multiplier(origin, depart)
     return math.ceil(miles / mph)
 
+def estimate_legs(legs, fuel_rate=FUEL_RATE, mpg=MPG, load_multiplier=LOAD_MULTIPLIER):
+    """
+    Price a batch of time-stamped legs: [(zip1, zip2, depart), ...] → list of
+    {"miles", "hours", "cost"}. Each leg is a distance lookup and a profile
+    lookup, so thousands of legs cost about as much as thousands of lookups.
+    """
+    out = []
+    for zip1, zip2, depart in legs:
+        miles = lookup_distance(zip1, zip2)
+        hours = estimate_hours(miles, depart=depart, origin=zip1)
+        out.append({"miles": miles, "hours": hours,
+                    "cost": cost_for_miles(miles, fuel_rate, mpg, load_multiplier, hours=hours)})
+    return out
+
 def is_viable_route(zip1, zip2, payout, threshold=1.5):
     """
     Determines if the job is worth the squeeze.
@@ -128,12 +158,15 @@ def is_within_radius(zip_dest, max_radius=150):
     """
     return lookup_distance(FOB_ZIP, zip_dest) <= max_radius
 
-def can_return_to_fob(zip_current, time_left_hr, avg_speed=25):
+def can_return_to_fob(zip_current, time_left_hr, avg_speed=25, depart=None):
     """
     Can you still make it home? Don’t guess — use this.
     Good for making sure your last gig doesn’t turn into your next lease.
+    Leaving at `depart`? Then the speed is whatever that hour usually allows.
     """
     miles = lookup_distance(zip_current, FOB_ZIP)
+    if depart is not None:
+        avg_speed = avg_speed * speed_profile.multiplier(zip_current, depart)
     return (miles / avg_speed) <= time_left_hr
 
 # ─────────────────────────────────────────────────────────────────────────────
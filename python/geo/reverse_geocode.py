@@ -0,0 +1,272 @@
+# python/geo/reverse_geocode.py
+# ─────────────────────────────────────────────────────────────────────────────
+# GPS fix → ZIP, from the same TIGER ZCTA shapefile zipcodes_by_state.py reads.
+#
+# Building (needs GeoPandas) simplifies every ZCTA polygon, quantizes its
+# vertices to 1e-5 degrees (~1 m) and buckets polygons by bounding box into a
+# CELL_DEG grid:
+#
+#   geo/db/zcta_polygons.i32    little-endian int32 sections, back to back
+#   geo/db/zcta_polygons.json   {"zips", "scale", "grid": {lon0, lat0, cell,
+#                                cols, rows}, "sections": {name: [start, len]},
+#                                "source_sha256"}
+#
+#   bbox        4 per ZIP     min lon, min lat, max lon, max lat
+#   centroid    2 per ZIP     lon, lat
+#   poly_rings  ZIPs + 1      first ring of each ZIP (exteriors and holes)
+#   ring_verts  rings + 1     first vertex of each ring
+#   verts       2 per vertex  lon, lat
+#   cell_start  cells + 1     first entry of each grid cell in cell_polys
+#   cell_polys  entries       ZIP indexes whose bbox touches the cell
+#
+# Looking up is stdlib only: the file is memory-mapped, the point's cell
+# gives a handful of candidates, and an even-odd ray cast over their rings
+# settles it in tens of microseconds. A point in no polygon (water, gaps the
+# simplification opened) falls back to the nearest centroid, searched outward
+# from the point's cell. The build is skipped when the shapefile is unchanged.
+#
+# Usage (from python/geo/, repo root on PYTHONPATH):
+#   PYTHONPATH=../.. python reverse_geocode.py --build
+#   PYTHONPATH=../.. python reverse_geocode.py 41.4845 -81.7993
+# ─────────────────────────────────────────────────────────────────────────────
+
+import hashlib
+import json
+import math
+import mmap
+import struct
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from python.common import fileio
+
+SHAPEFILE = Path("../../assets/geo/tiger_zcta_2024/tl_2024_us_zcta520.shp")
+DB_DIR = Path("../../geo/db")
+POLYGON_FILE = DB_DIR / "zcta_polygons.i32"
+INDEX_FILE = DB_DIR / "zcta_polygons.json"
+SCALE = 100_000           # vertex units per degree
+CELL_DEG = 0.2            # grid cell size
+SIMPLIFY_DEG = 0.0005     # ~50 m; keeps the file small and the ray casts short
+FALLBACK_RINGS = 3        # grid rings searched for a centroid before scanning all
+SECTIONS = ("bbox", "centroid", "poly_rings", "ring_verts", "verts", "cell_start", "cell_polys")
+
+
+def source_hash(shapefile=SHAPEFILE):
+    h = hashlib.sha256()
+    for path in sorted(Path(shapefile).parent.glob(Path(shapefile).stem + ".*")):
+        if path.suffix in (".shp", ".shx", ".dbf"):
+            h.update(path.name.encode())
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+    return h.hexdigest()
+
+
+def _rings(geom):
+    """Exterior and interior rings of a Polygon or MultiPolygon, closing vertex dropped."""
+    polys = geom.geoms if geom.geom_type == "MultiPolygon" else [geom]
+    for poly in polys:
+        for ring in [poly.exterior, *poly.interiors]:
+            yield list(ring.coords)[:-1]
+
+
+def read_shapes(shapefile=SHAPEFILE):
+    """[(zip, [ring, ...], (centroid lon, lat)), ...] sorted by ZIP, simplified."""
+    import geopandas as gpd
+
+    gdf = gpd.read_file(shapefile).rename(columns={"ZCTA5CE20": "zipcode"})
+    gdf["zipcode"] = gdf["zipcode"].astype(str)
+    gdf = gdf[gdf["zipcode"].str.fullmatch(r"\d{5}")].sort_values("zipcode")
+    # Centroids as in zipcodes_by_state.py (projected, then back to degrees).
+    centroids = gdf.to_crs(epsg=5070).centroid.to_crs(epsg=4326)
+    shapes = gdf.to_crs(epsg=4326).simplify(SIMPLIFY_DEG, preserve_topology=True)
+    return [(z, list(_rings(geom)), (c.x, c.y)) for z, geom, c in zip(gdf["zipcode"], shapes, centroids)]
+
+
+def build(shapefile=SHAPEFILE, polygon_path=POLYGON_FILE, index_path=INDEX_FILE, force=False):
+    """Write the polygon index unless the shapefile is unchanged. Returns the
+    number of ZIPs, or None if nothing needed rebuilding."""
+    digest = source_hash(shapefile)
+    if not force and Path(index_path).exists() and Path(polygon_path).exists():
+        with open(index_path, "r", encoding="utf-8") as f:
+            if json.load(f).get("source_sha256") == digest:
+                return None
+    return write_index(read_shapes(shapefile), polygon_path, index_path, digest)
+
+
+def write_index(shapes, polygon_path=POLYGON_FILE, index_path=INDEX_FILE, digest=None):
+    """Quantize, bucket and write `shapes` (as from read_shapes). Returns the ZIP count."""
+    import numpy as np
+
+    zips = [z for z, _, _ in shapes]
+    bbox, centroid, poly_rings, ring_verts, verts = [], [], [0], [0], []
+    for _, rings, (clon, clat) in shapes:
+        xs, ys = [], []
+        for ring in rings:
+            for lon, lat in ring:
+                x, y = round(lon * SCALE), round(lat * SCALE)
+                verts += (x, y)
+                xs.append(x)
+                ys.append(y)
+            ring_verts.append(len(verts) // 2)
+        poly_rings.append(len(ring_verts) - 1)
+        bbox += (min(xs), min(ys), max(xs), max(ys)) if xs else (0, 0, -1, -1)
+        centroid += (round(clon * SCALE), round(clat * SCALE))
+
+    cell = round(CELL_DEG * SCALE)
+    lon0 = min(bbox[0::4]) // cell * cell
+    lat0 = min(bbox[1::4]) // cell * cell
+    cols = (max(bbox[2::4]) - lon0) // cell + 1
+    rows = (max(bbox[3::4]) - lat0) // cell + 1
+    buckets = {}
+    for i in range(len(zips)):
+        x0, y0, x1, y1 = bbox[4 * i:4 * i + 4]
+        for r in range((y0 - lat0) // cell, (y1 - lat0) // cell + 1):
+            for c in range((x0 - lon0) // cell, (x1 - lon0) // cell + 1):
+                buckets.setdefault(r * cols + c, []).append(i)
+    cell_start, cell_polys = [0], []
+    for k in range(rows * cols):
+        cell_polys += buckets.get(k, ())
+        cell_start.append(len(cell_polys))
+
+    arrays = dict(zip(SECTIONS, (bbox, centroid, poly_rings, ring_verts, verts, cell_start, cell_polys)))
+    sections, start = {}, 0
+    for name in SECTIONS:
+        sections[name] = [start, len(arrays[name])]
+        start += len(arrays[name])
+    fileio.write_bytes(polygon_path, b"".join(np.asarray(arrays[name], dtype="<i4").tobytes() for name in SECTIONS))
+    fileio.write_json(index_path, {
+        "zips": zips,
+        "scale": SCALE,
+        "grid": {"lon0": lon0, "lat0": lat0, "cell": cell, "cols": cols, "rows": rows},
+        "sections": sections,
+        "source_sha256": digest,
+    }, compact=True)
+    load_index.cache_clear()
+    return len(zips)
+
+
+class PolygonIndex:
+    """Read-only, memory-mapped view of a built polygon index."""
+
+    def __init__(self, polygon_path=POLYGON_FILE, index_path=INDEX_FILE):
+        with open(index_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.zips = meta["zips"]
+        self.scale = meta.get("scale", SCALE)
+        grid = meta["grid"]
+        self.lon0, self.lat0, self.cell = grid["lon0"], grid["lat0"], grid["cell"]
+        self.cols, self.rows = grid["cols"], grid["rows"]
+        with open(polygon_path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        total = sum(n for _, n in meta["sections"].values())
+        if len(self._mm) != 4 * total:
+            raise ValueError(f"{polygon_path} does not match {index_path}; rebuild it")
+        # The file is little-endian; big-endian hosts unpack it once instead.
+        if sys.byteorder == "little":
+            ints = memoryview(self._mm).cast("i")
+        else:
+            ints = struct.unpack(f"<{total}i", self._mm)
+        for name, (start, n) in meta["sections"].items():
+            setattr(self, "_" + name, ints[start:start + n])
+
+    def _cell(self, x, y):
+        c, r = (x - self.lon0) // self.cell, (y - self.lat0) // self.cell
+        return r * self.cols + c if 0 <= c < self.cols and 0 <= r < self.rows else None
+
+    def _contains(self, i, x, y):
+        """Even-odd ray cast over every ring of ZIP i (holes cancel out)."""
+        verts = self._verts
+        inside = False
+        for ring in range(self._poly_rings[i], self._poly_rings[i + 1]):
+            start, end = self._ring_verts[ring], self._ring_verts[ring + 1]
+            jx, jy = verts[2 * end - 2], verts[2 * end - 1]
+            for k in range(start, end):
+                kx, ky = verts[2 * k], verts[2 * k + 1]
+                if (ky > y) != (jy > y) and x < (jx - kx) * (y - ky) / (jy - ky) + kx:
+                    inside = not inside
+                jx, jy = kx, ky
+        return inside
+
+    def _nearest_centroid(self, x, y):
+        """Nearest centroid among ZIPs bucketed within FALLBACK_RINGS cells,
+        else over every ZIP. Longitude is scaled by cos(lat) for the compare."""
+        k = math.cos(math.radians(y / self.scale)) ** 2
+        cent = self._centroid
+        best, best_d = None, None
+        c0, r0 = (x - self.lon0) // self.cell, (y - self.lat0) // self.cell
+        seen = set()
+        for r in range(max(0, r0 - FALLBACK_RINGS), min(self.rows, r0 + FALLBACK_RINGS + 1)):
+            for c in range(max(0, c0 - FALLBACK_RINGS), min(self.cols, c0 + FALLBACK_RINGS + 1)):
+                cell = r * self.cols + c
+                seen.update(self._cell_polys[self._cell_start[cell]:self._cell_start[cell + 1]])
+        for i in seen or range(len(self.zips)):
+            d = k * (cent[2 * i] - x) ** 2 + (cent[2 * i + 1] - y) ** 2
+            if best_d is None or d < best_d:
+                best, best_d = i, d
+        return best
+
+    def zip_at(self, lat, lon, fallback=True):
+        """ZIP containing (lat, lon); the nearest centroid's ZIP if none does and
+        `fallback`, else None."""
+        x, y = round(lon * self.scale), round(lat * self.scale)
+        cell = self._cell(x, y)
+        if cell is not None:
+            bbox = self._bbox
+            for i in self._cell_polys[self._cell_start[cell]:self._cell_start[cell + 1]]:
+                if bbox[4 * i] <= x <= bbox[4 * i + 2] and bbox[4 * i + 1] <= y <= bbox[4 * i + 3] \
+                        and self._contains(i, x, y):
+                    return self.zips[i]
+        if not fallback:
+            return None
+        i = self._nearest_centroid(x, y)
+        return self.zips[i] if i is not None else None
+
+
+@lru_cache(maxsize=None)
+def load_index(polygon_path=POLYGON_FILE, index_path=INDEX_FILE):
+    """The shared index, or None if it hasn't been built."""
+    try:
+        return PolygonIndex(polygon_path, index_path)
+    except (OSError, ValueError):
+        return None
+
+
+def zip_at(lat, lon, fallback=True):
+    """ZIP for a GPS fix, or None if no index has been built."""
+    index = load_index()
+    return index.zip_at(lat, lon, fallback) if index is not None else None
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Reverse-geocode a GPS fix to a ZIP, or build the polygon index.")
+    ap.add_argument("lat", nargs="?", type=float)
+    ap.add_argument("lon", nargs="?", type=float)
+    ap.add_argument("--build", action="store_true", help=f"Build the index from {SHAPEFILE}")
+    ap.add_argument("--force", action="store_true", help="Rebuild even if the shapefile is unchanged")
+    args = ap.parse_args()
+
+    if args.build or args.force:
+        t0 = time.perf_counter()
+        n = build(force=args.force)
+        if n is None:
+            print(f"✅ polygon index up to date: {POLYGON_FILE}")
+        else:
+            size = POLYGON_FILE.stat().st_size
+            print(f"✅ {n} ZIPs, {size:,} bytes written to {POLYGON_FILE} ({time.perf_counter() - t0:.1f}s)")
+    if args.lat is None or args.lon is None:
+        return
+    t0 = time.perf_counter()
+    z = zip_at(args.lat, args.lon)
+    us = (time.perf_counter() - t0) * 1e6
+    if z is None:
+        print("⚠️ no polygon index; run reverse_geocode.py --build")
+    else:
+        print(f"📍 {args.lat}, {args.lon} → {z} ({us:.0f} µs, including load)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# python/geo/speed_profile.py
+# ─────────────────────────────────────────────────────────────────────────────
+# Hour-of-week speed multipliers per zone, so 5 pm on a Friday isn't priced
+# like 2 am on a Sunday.
+#
+# The table is (zones + 1) rows x 168 hour-of-week slots (Monday 00:00 = 0) of
+# uint8 hundredths: AVG_SPEED x cell / 100 is the mph for a leg starting in
+# that zone and hour. The last row is the area-wide profile for ZIPs outside
+# the zones. Every row starts from a default weekday/weekend rush-hour shape;
+# if route/db/speed_observations.csv exists (zipcode, depart, miles, minutes),
+# observed speeds are blended in per zone and slot, weighted by sample count.
+#
+#   geo/db/speed_profile.json  {"slots": 168, "scale": 100, "zip_zone": {...},
+#                               "rows", "table": base64 uint8}
+#
+# A lookup is one dict hit for the zone plus one byte read; the table is
+# loaded once per process.
+#
+# Usage (from python/geo/, repo root on PYTHONPATH, after zones.py):
+#   PYTHONPATH=../.. python speed_profile.py
+# ─────────────────────────────────────────────────────────────────────────────
+
+import base64
+import csv
+import json
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+from python.common import fileio
+
+DB_DIR = Path("../../geo/db")
+PROFILE_FILE = DB_DIR / "speed_profile.json"
+OBSERVATIONS_FILE = Path("../../route/db/speed_observations.csv")
+SLOTS = 168
+SCALE = 100
+PRIOR_OBS = 20     # observations needed before a slot trusts data over the default shape
+
+
+def default_multiplier(slot):
+    """Speed multiplier for an hour-of-week slot before any observations."""
+    day, hour = divmod(slot, 24)
+    if hour < 5 or hour >= 22:
+        return 1.15                     # empty roads
+    if day >= 5:
+        return 1.05 if hour < 11 else 0.95
+    if 7 <= hour < 9:
+        return 0.80                     # morning rush
+    if 16 <= hour < 18:
+        return 0.75                     # evening rush
+    if 11 <= hour < 14:
+        return 0.95                     # lunch
+    return 1.0
+
+
+def slot_of(depart):
+    """Hour-of-week slot for a datetime or ISO string (Monday 00:00 = 0)."""
+    if isinstance(depart, str):
+        depart = datetime.fromisoformat(depart)
+    return depart.weekday() * 24 + depart.hour
+
+
+def _observed(path, zip_zone, rows):
+    """{(row, slot): [miles, hours, n]} from the observations CSV, if any."""
+    acc = {}
+    if not Path(path).exists():
+        return acc
+    with open(path, newline="", encoding="utf-8") as f:
+        for rec in csv.DictReader(f):
+            try:
+                miles, minutes = float(rec["miles"]), float(rec["minutes"])
+                slot = slot_of(rec["depart"])
+            except (KeyError, ValueError):
+                continue
+            if miles <= 0 or minutes <= 0:
+                continue
+            for row in {zip_zone.get(rec.get("zipcode"), rows - 1), rows - 1}:
+                cell = acc.setdefault((row, slot), [0.0, 0.0, 0])
+                cell[0] += miles
+                cell[1] += minutes / 60
+                cell[2] += 1
+    return acc
+
+
+def build(out_path=PROFILE_FILE, observations=OBSERVATIONS_FILE):
+    """Write the multiplier table for the current zones. Returns True if it changed."""
+    from python.geo import logistics, zones
+
+    table = zones.load_zones()
+    zip_zone = table["zip_zone"] if table else {}
+    rows = (len(table["zones"]) if table else 0) + 1
+    observed = _observed(observations, zip_zone, rows)
+
+    cells = bytearray(rows * SLOTS)
+    for row in range(rows):
+        for slot in range(SLOTS):
+            m = default_multiplier(slot)
+            if (row, slot) in observed:
+                miles, hours, n = observed[(row, slot)]
+                w = n / (n + PRIOR_OBS)
+                m = w * (miles / hours / logistics.AVG_SPEED) + (1 - w) * m
+            cells[row * SLOTS + slot] = max(1, min(255, round(m * SCALE)))
+
+    changed = fileio.write_json(out_path, {
+        "slots": SLOTS,
+        "scale": SCALE,
+        "rows": rows,
+        "zip_zone": zip_zone,
+        "table": base64.b64encode(bytes(cells)).decode("ascii"),
+    }, compact=True)
+    load_profile.cache_clear()
+    return changed
+
+
+@lru_cache(maxsize=None)
+def load_profile(path=PROFILE_FILE):
+    """(zip_zone, table bytes, default row) or None if no profile was built."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta["zip_zone"], base64.b64decode(meta["table"]), meta["rows"] - 1
+
+
+def multiplier(zipcode, depart):
+    """Speed multiplier for a leg starting at `zipcode` at `depart`. Falls back
+    to the default shape when no table is built."""
+    slot = slot_of(depart)
+    profile = load_profile()
+    if profile is None:
+        return default_multiplier(slot)
+    zip_zone, cells, default_row = profile
+    return cells[zip_zone.get(zipcode, default_row) * SLOTS + slot] / SCALE
+
+
+def main():
+    changed = build()
+    print(f"✅ speed profile {'written' if changed else 'unchanged'}: {PROFILE_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 import geopandas as gpd
-import json
 from collections import defaultdict
 from pathlib import Path
+from python.common import fileio
 
 # Input and output paths
 INPUT = Path("../../assets/geo/tiger_zcta_2024/tl_2024_us_zcta520.shp")
@@ -52,5 +52,4 @@ for _, row in gdf.iterrows():
 # Write JSON for each prefix
 for prefix, entries in records_by_prefix.items():
     out_path = OUTPUT_DIR / f"{prefix}.json"
-    with out_path.open("w", encoding="utf-8") as f:
-        json.dump(entries, f, indent=2)
\ No newline at end of file
+    fileio.write_json(out_path, entries)
\ No newline at end of file
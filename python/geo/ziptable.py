@@ -0,0 +1,194 @@
+# python/geo/ziptable.py
+# ─────────────────────────────────────────────────────────────────────────────
+# Every ZIP in geo/db/ as one column store instead of ~33k six-key dicts.
+#
+# ZIPs are kept sorted as uint32 (leading zeros restored on the way out) next
+# to float64 columns for lat, lon, lat_p, lon_p (EPSG:5070 meters) and
+# gas_price; a missing value is NaN. The full US set is about 1.5 MB, a
+# lookup is one bisect, and columns() hands out zero-copy NumPy views for
+# the vectorized distance and radius code.
+#
+# Rows are read-only ZipRow views (__slots__, two fields) that still answer
+# row["lat"] and row.get("gas_price"), so code written against the shard dicts
+# keeps working.
+#
+# Usage (from python/geo/, repo root on PYTHONPATH):
+#   PYTHONPATH=../.. python ziptable.py 44107
+# ─────────────────────────────────────────────────────────────────────────────
+
+import json
+import math
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from pathlib import Path
+
+DB_DIR = Path("../../geo/db")
+FIELDS = ("lat", "lon", "lat_p", "lon_p", "gas_price")
+
+
+class ZipRow:
+    """Read-only view of one ZIP in a ZipTable."""
+
+    __slots__ = ("_table", "_i")
+
+    def __init__(self, table, i):
+        self._table = table
+        self._i = i
+
+    @property
+    def zipcode(self):
+        return f"{self._table._zips[self._i]:05d}"
+
+    def __getattr__(self, name):
+        if name in FIELDS:
+            value = self._table._columns[name][self._i]
+            return None if math.isnan(value) else value
+        raise AttributeError(name)
+
+    def __getitem__(self, key):
+        if key == "zipcode" or key in FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return default if value is None else value
+
+    def keys(self):
+        return ("zipcode",) + FIELDS
+
+    def as_dict(self):
+        return {key: self[key] for key in self.keys()}
+
+    def __repr__(self):
+        return f"ZipRow({self.as_dict()!r})"
+
+
+class ZipTable:
+    """Sorted, column-backed ZIP metadata."""
+
+    def __init__(self, records=()):
+        keyed = ((_key(str(r.get("zipcode", ""))), r) for r in records)
+        records = sorted(((z, r) for z, r in keyed if z is not None), key=lambda zr: zr[0])
+        self._zips = array("I", (z for z, _ in records))
+        self._columns = {name: array("d", (_float(r.get(name)) for _, r in records)) for name in FIELDS}
+
+    @classmethod
+    def from_shards(cls, db_dir=DB_DIR):
+        records = []
+        for path in sorted(Path(db_dir).glob("[0-9][0-9].json")):
+            with open(path, "r", encoding="utf-8") as f:
+                records += json.load(f)
+        return cls(records)
+
+    def __len__(self):
+        return len(self._zips)
+
+    def index(self, zipcode):
+        """Row index of `zipcode` (a 5-digit string), or None."""
+        z = _key(zipcode)
+        if z is None:
+            return None
+        i = bisect_left(self._zips, z)
+        return i if i < len(self._zips) and self._zips[i] == z else None
+
+    def __contains__(self, zipcode):
+        return self.index(zipcode) is not None
+
+    def get(self, zipcode, default=None):
+        i = self.index(zipcode)
+        return default if i is None else ZipRow(self, i)
+
+    def __getitem__(self, zipcode):
+        i = self.index(zipcode)
+        if i is None:
+            raise KeyError(zipcode)
+        return ZipRow(self, i)
+
+    def row(self, i):
+        return ZipRow(self, i)
+
+    def __iter__(self):
+        return (ZipRow(self, i) for i in range(len(self._zips)))
+
+    def zipcodes(self, indexes=None):
+        """ZIP strings, for all rows or for `indexes`."""
+        rows = range(len(self._zips)) if indexes is None else indexes
+        return [f"{self._zips[i]:05d}" for i in rows]
+
+    # ─── Bulk, NumPy ─────────────────────────────────────────────────────────
+    def columns(self, *names):
+        """Zero-copy float64 NumPy views of the named columns (NaN = missing)."""
+        import numpy as np
+        return tuple(np.frombuffer(self._columns[name], dtype=np.float64) for name in names)
+
+    def indexes(self, zipcodes):
+        """Row indexes for `zipcodes` as a NumPy array; ValueError naming any missing."""
+        import numpy as np
+        keys = np.array([-1 if (k := _key(z)) is None else k for z in zipcodes], dtype=np.int64)
+        zips = np.frombuffer(self._zips, dtype=np.uint32)
+        idx = np.minimum(np.searchsorted(zips, keys), max(len(zips) - 1, 0))
+        found = (zips[idx] == keys) if len(zips) else np.zeros(len(keys), dtype=bool)
+        if not found.all():
+            missing = sorted({str(z) for z, ok in zip(zipcodes, found) if not ok})
+            raise ValueError(f"ZIPs not found: {', '.join(missing[:10])}")
+        return idx
+
+    def coords(self, zipcodes):
+        """(lat, lon) NumPy arrays for `zipcodes`."""
+        idx = self.indexes(zipcodes)
+        lat, lon = self.columns("lat", "lon")
+        return lat[idx], lon[idx]
+
+    def within(self, lat, lon, radius):
+        """Sorted row indexes of ZIPs within `radius` crow-flies miles of (lat, lon)."""
+        import numpy as np
+        from python.geo.logistics import EARTH_RADIUS_MI
+        lats, lons = (np.radians(c) for c in self.columns("lat", "lon"))
+        lat, lon = math.radians(lat), math.radians(lon)
+        a = np.sin((lats - lat) / 2) ** 2 + math.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+        miles = 2 * EARTH_RADIUS_MI * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+        return np.nonzero(miles <= radius)[0]
+
+
+def _key(zipcode):
+    """uint32 key for an exact 5-digit ZIP string; None for anything else
+    ("4410", "044107", " 44107", 44107), so near-misses never match."""
+    if isinstance(zipcode, str) and len(zipcode) == 5 and zipcode.isascii() and zipcode.isdigit():
+        return int(zipcode)
+    return None
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+@lru_cache(maxsize=None)
+def load_table(db_dir=DB_DIR):
+    """The whole-country table, read from the shards once per process."""
+    return ZipTable.from_shards(db_dir)
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Print ZIP rows from the column store.")
+    ap.add_argument("zips", nargs="*")
+    args = ap.parse_args()
+
+    table = load_table()
+    size = table._zips.itemsize * len(table) + sum(c.itemsize * len(c) for c in table._columns.values())
+    print(f"✅ {len(table):,} ZIPs in {size / 1e6:.2f} MB of columns")
+    for z in args.zips:
+        row = table.get(z)
+        print(f"  {z}: {row.as_dict() if row is not None else 'not found'}")
+
+
+if __name__ == "__main__":
+    main()
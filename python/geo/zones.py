@@ -0,0 +1,152 @@
+# python/geo/zones.py
+# ─────────────────────────────────────────────────────────────────────────────
+# Zones for fast, approximate offer triage.
+#
+# Service-area ZIPs (within MAX_MILES of the FOB) are clustered with k-means on
+# their projected representative points (lat_p/lon_p, EPSG:5070 meters, so
+# plain Euclidean distance is fair). Each zone keeps its lat/lon centroid and
+# its radius: how far its farthest member sits from that centroid.
+#
+# The zone-to-zone matrices price a leg between centroids with estimate_cost
+# semantics (miles → whole hours → fuel + margin per hour, times the load).
+# Any ZIP-level leg between zones a and b is within radius[a] + radius[b]
+# miles of the centroid distance, which is what python.route.triage turns
+# into cost bounds.
+#
+#   geo/db/zones.json   {"k", "params", "source_sha256", "zones": [{lat, lon,
+#                        radius_mi, n}], "zip_zone": {zip: zone},
+#                        "miles", "hours", "cost": k x k}
+#
+# Usage (from python/geo/, repo root on PYTHONPATH):
+#   PYTHONPATH=../.. python zones.py                  # build if shards/params changed
+#   PYTHONPATH=../.. python zones.py -k 96 --force
+# ─────────────────────────────────────────────────────────────────────────────
+
+import json
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from python.common import fileio
+from python.geo import distance_matrix, logistics, ziptable
+
+DB_DIR = Path("../../geo/db")
+ZONES_FILE = DB_DIR / "zones.json"
+K = 64
+ITERATIONS = 50
+SEED = 44107
+
+
+def service_area_rows(db_dir=DB_DIR, fob_zip=logistics.FOB_ZIP, radius=logistics.MAX_MILES):
+    """ZipTable rows (with lat/lon and lat_p/lon_p) within `radius` miles of the FOB."""
+    table = ziptable.load_table(Path(db_dir))
+    fob = table.get(fob_zip)
+    if fob is None or fob.lat is None or fob.lon is None:
+        raise ValueError(f"FOB ZIP {fob_zip} not found in {db_dir}")
+    import numpy as np
+    lat_p, lon_p = table.columns("lat_p", "lon_p")
+    keep = table.within(fob.lat, fob.lon, radius)
+    return [table.row(i) for i in keep[~np.isnan(lat_p[keep] + lon_p[keep])]]
+
+
+def kmeans(points, k, iterations=ITERATIONS, seed=SEED):
+    """Lloyd's k-means with k-means++ seeding. Returns (labels, centers)."""
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    k = min(k, len(points))
+    centers = [points[rng.integers(len(points))]]
+    d2 = ((points - centers[0]) ** 2).sum(axis=1)
+    for _ in range(1, k):
+        centers.append(points[rng.choice(len(points), p=d2 / d2.sum())] if d2.sum() > 0
+                       else points[rng.integers(len(points))])
+        d2 = np.minimum(d2, ((points - centers[-1]) ** 2).sum(axis=1))
+    centers = np.array(centers)
+    labels = None
+    for _ in range(iterations):
+        dist = ((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        new = dist.argmin(axis=1)
+        if labels is not None and (new == labels).all():
+            break
+        labels = new
+        for z in range(k):
+            members = points[labels == z]
+            if len(members):
+                centers[z] = members.mean(axis=0)
+    return labels, centers
+
+
+def cost_params():
+    return {"mpg": logistics.MPG, "fuel_rate": logistics.FUEL_RATE, "avg_speed": logistics.AVG_SPEED,
+            "load_multiplier": logistics.LOAD_MULTIPLIER, "margin_per_hour": logistics.MIN_MARGIN_PER_GIG}
+
+
+def build(db_dir=DB_DIR, out_path=ZONES_FILE, k=K, force=False):
+    """Cluster the service area and write the zone matrices. Returns the zone
+    count, or None if the shards, k and cost parameters are unchanged."""
+    import numpy as np
+
+    digest = distance_matrix.source_hash(db_dir)
+    params = cost_params()
+    if not force and Path(out_path).exists():
+        with open(out_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if (meta.get("source_sha256"), meta.get("k"), meta.get("params")) == (digest, k, params):
+            return None
+
+    rows = service_area_rows(db_dir)
+    labels, _ = kmeans(np.array([[r["lon_p"], r["lat_p"]] for r in rows], dtype=float), k)
+
+    zones = []
+    for z in range(labels.max() + 1):
+        members = [r for r, label in zip(rows, labels) if label == z]
+        lat = sum(r["lat"] for r in members) / len(members)
+        lon = sum(r["lon"] for r in members) / len(members)
+        radius = max(logistics.haversine(lat, lon, r["lat"], r["lon"]) for r in members)
+        zones.append({"lat": round(lat, 6), "lon": round(lon, 6), "radius_mi": round(radius, 2), "n": len(members)})
+
+    miles = [[round(logistics.haversine(a["lat"], a["lon"], b["lat"], b["lon"]), 2) for b in zones] for a in zones]
+    out = {
+        "k": k,
+        "params": params,
+        "source_sha256": digest,
+        "zones": zones,
+        "zip_zone": {r["zipcode"]: int(label) for r, label in zip(rows, labels)},
+        "miles": miles,
+        "hours": [[logistics.estimate_hours(m) for m in row] for row in miles],
+        "cost": [[logistics.cost_for_miles(m) for m in row] for row in miles],
+    }
+    fileio.write_json(out_path, out, compact=True)
+    load_zones.cache_clear()
+    return len(zones)
+
+
+@lru_cache(maxsize=None)
+def load_zones(path=ZONES_FILE):
+    """The built zone table, or None if it hasn't been built."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Cluster service-area ZIPs into zones and precompute zone-to-zone costs.")
+    ap.add_argument("-k", type=int, default=K, help=f"Number of zones (default: {K})")
+    ap.add_argument("--force", action="store_true", help="Rebuild even if nothing changed")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    n = build(k=args.k, force=args.force)
+    if n is None:
+        print(f"✅ zones up to date: {ZONES_FILE}")
+    else:
+        zones = load_zones()["zones"]
+        worst = max(z["radius_mi"] for z in zones)
+        print(f"✅ {n} zones written to {ZONES_FILE}; widest radius {worst:.1f} mi "
+              f"({time.perf_counter() - t0:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
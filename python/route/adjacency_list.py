@@ -1,6 +1,7 @@
 import json
 from python.geo.logistics import haversine
 from pathlib import Path
+from python.common import fileio
 
 # Constants
 FOB_LAT, FOB_LON = 41.4822, -81.7995  # Lakewood, OH
@@ -22,7 +23,6 @@ for z in zip_data:
             nearby_zips.append(z)
 
 # Write filtered data to output file
-with OUTPUT_FILE.open("w") as f:
-    json.dump(nearby_zips, f, indent=2)
+fileio.write_json(OUTPUT_FILE, nearby_zips)
 
 print(f"✅ Saved {len(nearby_zips)} ZIP codes within {RADIUS_MILES}mi of 44107 to {OUTPUT_FILE}")
\ No newline at end of file
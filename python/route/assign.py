@@ -0,0 +1,177 @@
+# python/route/assign.py
+# ─────────────────────────────────────────────────────────────────────────────
+# Several drivers, many offers: who takes what?
+#
+# Every driver/offer pair is scored the way go_or_no scores one offer — the
+# payout minus the cost of driver → pickup → dropoff → FOB, against the cost
+# of just heading home from where the driver is. Pairs that would blow the
+# driver's remaining miles or hours are ruled out. The whole N x M matrix is
+# one NumPy pass over crow-flies distances, and the assignment maximizing
+# total net gain comes from scipy's linear_sum_assignment when SciPy is
+# installed, else from the Hungarian method below. N dummy "go home" columns
+# (gain 0) let a driver stay unassigned rather than take a losing offer.
+#
+# Board JSON:
+#   {"drivers": [{"id", "zip", "miles_today" | "miles_left", "hours_left"}, ...],
+#    "offers":  [{"id", "pickup", "dropoff", "payout"}, ...]}
+#
+# Usage (from python/route/, repo root on PYTHONPATH):
+#   PYTHONPATH=../.. python assign.py               # route/db/board.json
+#   PYTHONPATH=../.. python assign.py board.json
+# ─────────────────────────────────────────────────────────────────────────────
+
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from python.geo import logistics, ziptable
+
+try:
+    from scipy.optimize import linear_sum_assignment  # optional (falls back to hungarian())
+except Exception:
+    linear_sum_assignment = None
+
+BOARD_FILE = Path("../../route/db/board.json")
+INFEASIBLE = -1e9
+
+
+def coords(zips, db_dir=logistics.DB_DIR):
+    """(lat, lon) arrays for `zips`, gathered from the shared ZipTable."""
+    return ziptable.load_table(Path(db_dir)).coords(zips)
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Broadcasting logistics.haversine, rounded to 0.01 mi like lookup_distance."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return np.round(2 * logistics.EARTH_RADIUS_MI * np.arctan2(np.sqrt(a), np.sqrt(1 - a)), 2)
+
+
+def leg_hours(miles, mph=logistics.AVG_SPEED):
+    return np.ceil(miles / mph)
+
+
+def leg_cost(miles, fuel_rate=logistics.FUEL_RATE, mpg=logistics.MPG, load_multiplier=logistics.LOAD_MULTIPLIER):
+    """Broadcasting logistics.cost_for_miles."""
+    labour = logistics.MIN_MARGIN_PER_GIG * leg_hours(miles)
+    return np.round((miles / mpg * fuel_rate + labour) * load_multiplier, 2)
+
+
+def gain_matrix(drivers, offers):
+    """(gain, miles) N x M arrays; infeasible pairs get INFEASIBLE gain."""
+    d_lat, d_lon = coords([str(d["zip"]) for d in drivers])
+    p_lat, p_lon = coords([str(o["pickup"]) for o in offers])
+    q_lat, q_lon = coords([str(o["dropoff"]) for o in offers])
+    f_lat, f_lon = coords([logistics.FOB_ZIP])
+    payout = np.array([float(o["payout"]) for o in offers])
+
+    to_pickup = haversine(d_lat[:, None], d_lon[:, None], p_lat[None, :], p_lon[None, :])   # N x M
+    loaded = haversine(p_lat, p_lon, q_lat, q_lon)                                            # M
+    home_after = haversine(q_lat, q_lon, f_lat, f_lon)                                        # M
+    home_now = haversine(d_lat, d_lon, f_lat, f_lon)                                          # N
+
+    gain = (payout - leg_cost(loaded) - leg_cost(home_after))[None, :] - leg_cost(to_pickup) + leg_cost(home_now)[:, None]
+    miles = to_pickup + (loaded + home_after)[None, :]
+    hours = leg_hours(to_pickup) + (leg_hours(loaded) + leg_hours(home_after))[None, :]
+
+    miles_left = np.array([float(d["miles_left"]) if "miles_left" in d
+                           else logistics.miles_remaining(float(d.get("miles_today", 0))) for d in drivers])
+    hours_left = np.array([float(d.get("hours_left", logistics.MAX_HOURS)) for d in drivers])
+    feasible = (miles <= miles_left[:, None]) & (hours <= hours_left[:, None])
+    return np.where(feasible, gain, INFEASIBLE), miles
+
+
+def hungarian(cost):
+    """Minimum-cost assignment of every row of an n x m (n <= m) matrix.
+    Shortest augmenting paths with potentials; the inner scan over columns is
+    vectorized, so it's O(n^2 m) in NumPy rather than Python. Returns col per row."""
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=int)       # p[j]: 1-based row matched to column j (0 = free)
+    way = np.zeros(m + 1, dtype=int)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            cur = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (cur < minv[1:])
+            minv[1:][better] = cur[better]
+            way[1:][better] = j0
+            masked = np.where(free, minv[1:], np.inf)
+            j1 = int(masked.argmin()) + 1
+            delta = masked[j1 - 1]
+            seen = np.nonzero(used)[0]
+            u[p[seen]] += delta
+            v[seen] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    cols = np.empty(n, dtype=int)
+    for j in range(1, m + 1):
+        if p[j]:
+            cols[p[j] - 1] = j - 1
+    return cols
+
+
+def assign(drivers, offers):
+    """Maximize total net gain. Returns (assignments, report)."""
+    solver = "scipy" if linear_sum_assignment is not None else "hungarian"
+    if not drivers or not offers:
+        return [], {"drivers": len(drivers), "offers": len(offers), "assigned": 0, "total_net_gain": 0.0,
+                    "solver": solver}
+    gain, miles = gain_matrix(drivers, offers)
+    n, m = gain.shape
+    # Dummy columns: driver i may go home (gain 0) instead of taking anything.
+    padded = np.hstack([gain, np.full((n, n), INFEASIBLE)])
+    padded[np.arange(n), m + np.arange(n)] = 0.0
+    if linear_sum_assignment is not None:
+        rows, cols = linear_sum_assignment(-padded)
+    else:
+        rows, cols = np.arange(n), hungarian(-padded)
+
+    out = []
+    for i, j in zip(rows, cols):
+        if j < m and gain[i, j] > 0:
+            out.append({"driver": drivers[i].get("id", i), "offer": offers[j].get("id", j),
+                        "pickup": str(offers[j]["pickup"]), "dropoff": str(offers[j]["dropoff"]),
+                        "net_gain": round(float(gain[i, j]), 2), "miles": round(float(miles[i, j]), 2)})
+    report = {"drivers": n, "offers": m, "assigned": len(out),
+              "total_net_gain": round(sum(a["net_gain"] for a in out), 2),
+              "solver": solver}
+    return out, report
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Assign open offers to drivers for maximum total net gain.")
+    ap.add_argument("board", nargs="?", default=str(BOARD_FILE), help=f"Board JSON (default: {BOARD_FILE})")
+    args = ap.parse_args()
+
+    with open(args.board, "r", encoding="utf-8") as f:
+        board = json.load(f)
+    t0 = time.perf_counter()
+    assignments, report = assign(board.get("drivers", []), board.get("offers", []))
+    ms = (time.perf_counter() - t0) * 1000
+
+    for a in assignments:
+        print(f"  🚚 {a['driver']} ← {a['offer']}  {a['pickup']} → {a['dropoff']}  "
+              f"net ${a['net_gain']:.2f}  {a['miles']:.1f} mi")
+    print(f"\n✅ {report['assigned']} of {report['drivers']} drivers assigned from {report['offers']} offers, "
+          f"total net ${report['total_net_gain']:.2f} ({report['solver']}, {ms:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import json
 from pathlib import Path
 from python.geo.logistics import haversine
+from python.common import fileio
+from python.route.contraction import CH_FILE, ensure_hierarchy
 
 # File paths
 INPUT_FILE = Path("../../route/db/44107.json")
@@ -29,7 +31,10 @@ for i, zip_a in enumerate(nodes):
             adj_graph[a_code][b_code] = round(dist, 2)
 
 # Write adjacency graph
-with OUTPUT_FILE.open("w") as f:
-    json.dump(adj_graph, f, indent=2)
+fileio.write_json(OUTPUT_FILE, adj_graph)
 
-print(f"✅ Adjacency graph saved with {len(adj_graph)} nodes to {OUTPUT_FILE}")
\ No newline at end of file
+print(f"✅ Adjacency graph saved with {len(adj_graph)} nodes to {OUTPUT_FILE}")
+
+# Refresh the contraction hierarchy (a no-op when graph.json didn't change)
+if ensure_hierarchy(OUTPUT_FILE):
+    print(f"✅ Contraction hierarchy rebuilt to {CH_FILE}")
@@ -0,0 +1,227 @@
+# python/route/contraction.py
+# ─────────────────────────────────────────────────────────────────────────────
+# Contraction hierarchy over the ZIP adjacency graph from build_graph.py.
+#
+# Preprocessing contracts nodes one at a time (cheapest edge difference first,
+# lazily re-evaluated) and adds a shortcut u—w whenever the path u—v—w is the
+# only shortest one, as checked by a bounded witness search. Each node then
+# keeps only its edges to higher-ranked nodes, so a query is a forward upward
+# search from one ZIP meeting a backward upward search from the other.
+#
+# Both searches are precomputed: every node's upward search space is stored
+# (pruned of hubs that can't be a meeting point), so a query is a single pass
+# over the smaller space with dict lookups into the other — tens of µs in pure
+# Python, where running the two Dijkstras live costs about a millisecond on
+# dense hop graphs.
+#
+# The result is saved next to graph.json with that file's sha256 and is
+# rebuilt only when the graph changes.
+#
+# Usage (from python/route/, repo root on PYTHONPATH):
+#   PYTHONPATH=../.. python contraction.py                # build if stale
+#   PYTHONPATH=../.. python contraction.py 44107 44111    # distance in miles
+# ─────────────────────────────────────────────────────────────────────────────
+
+import hashlib
+import heapq
+import json
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from python.common import fileio
+
+GRAPH_FILE = Path("../../route/db/graph.json")
+CH_FILE = Path("../../route/db/graph.ch.json")
+INF = float("inf")
+WITNESS_SETTLE_LIMIT = 25   # nodes a witness search may settle before giving up (adds a shortcut)
+
+
+def graph_hash(graph_path=GRAPH_FILE):
+    return hashlib.sha256(Path(graph_path).read_bytes()).hexdigest()
+
+
+def _witness(adj, source, skip, targets, limit):
+    """Distances from `source` in the remaining graph without `skip`, up to `limit`
+    or until every target is settled."""
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    settled = 0
+    pending = set(targets)
+    while heap and pending and settled < WITNESS_SETTLE_LIMIT:
+        d, u = heapq.heappop(heap)
+        if d > dist.get(u, INF):
+            continue
+        if d > limit:
+            break
+        settled += 1
+        pending.discard(u)
+        for w, weight in adj[u].items():
+            if w == skip:
+                continue
+            nd = d + weight
+            if nd <= limit and nd < dist.get(w, INF):
+                dist[w] = nd
+                heapq.heappush(heap, (nd, w))
+    return dist
+
+
+def _shortcuts(adj, v):
+    """Shortcuts (u, w, weight) needed if v were contracted now, each pair once."""
+    nbrs = list(adj[v].items())
+    out = []
+    for i, (u, wu) in enumerate(nbrs):
+        rest = nbrs[i + 1:]
+        if not rest:
+            break
+        dist = _witness(adj, u, v, [w for w, _ in rest], wu + max(w for _, w in rest))
+        for w, ww in rest:
+            if dist.get(w, INF) > wu + ww:
+                out.append((u, w, wu + ww))
+    return out
+
+
+def _priority(adj, v, deleted, shortcuts):
+    # Edge difference, plus already-contracted neighbours to keep contraction spread out.
+    return len(shortcuts) - len(adj[v]) + deleted[v]
+
+
+def build_hierarchy(graph):
+    """graph: {zip: {zip: miles}}. Returns {"nodes", "rank", "up"} where up[i] is
+    [[j, miles], ...] for every edge or shortcut from i to a higher-ranked j."""
+    nodes = sorted(set(graph) | {b for nbrs in graph.values() for b in nbrs})
+    index = {z: i for i, z in enumerate(nodes)}
+    adj = [dict() for _ in nodes]
+    for a, nbrs in graph.items():
+        for b, miles in nbrs.items():
+            i, j = index[a], index[b]
+            if i != j:
+                # graph.json is symmetric; keep the shorter if it ever isn't.
+                m = min(float(miles), adj[i].get(j, INF))
+                adj[i][j] = adj[j][i] = m
+
+    deleted = [0] * len(nodes)
+    heap = [(_priority(adj, v, deleted, _shortcuts(adj, v)), v) for v in range(len(nodes))]
+    heapq.heapify(heap)
+    rank = [0] * len(nodes)
+    up = [[] for _ in nodes]
+    order = 0
+    while heap:
+        _, v = heapq.heappop(heap)
+        # Lazy update: contract only if v is still the cheapest after recomputing.
+        shortcuts = _shortcuts(adj, v)
+        p = _priority(adj, v, deleted, shortcuts)
+        if heap and p > heap[0][0]:
+            heapq.heappush(heap, (p, v))
+            continue
+        for u, w, miles in shortcuts:
+            if miles < adj[u].get(w, INF):
+                adj[u][w] = adj[w][u] = miles
+        rank[v] = order
+        order += 1
+        for u, miles in adj[v].items():
+            up[v].append([u, round(miles, 2)])
+            del adj[u][v]
+            deleted[u] += 1
+        adj[v] = {}
+    return {"nodes": nodes, "rank": rank, "up": up}
+
+
+def _meet(a, b):
+    # Best meeting point of a forward and a backward upward search.
+    if len(a) > len(b):
+        a, b = b, a
+    best = INF
+    for h, d in a.items():
+        other = b.get(h)
+        if other is not None and d + other < best:
+            best = d + other
+    return best
+
+
+def search_spaces(rank, up):
+    """Upward search space [[hub, miles], ...] of every node. Hubs are filled in
+    highest rank first from each node's upward edges, and a hub is dropped when
+    another hub already proves a shorter path to it (it can never be where the
+    two searches of a query meet)."""
+    labels = [None] * len(rank)
+    for v in sorted(range(len(rank)), key=rank.__getitem__, reverse=True):
+        space = {v: 0.0}
+        for u, w in up[v]:
+            for h, d in labels[u].items():
+                nd = d + w
+                if nd < space.get(h, INF):
+                    space[h] = nd
+        for h in [h for h in space if h != v]:
+            if _meet(space, labels[h]) < space[h] - 1e-9:
+                del space[h]
+        labels[v] = space
+    return [sorted([h, round(d, 3)] for h, d in space.items()) for space in labels]
+
+
+def ensure_hierarchy(graph_path=GRAPH_FILE, ch_path=CH_FILE, force=False):
+    """Rebuild and save the hierarchy if graph.json changed. Returns True if rebuilt."""
+    digest = graph_hash(graph_path)
+    if not force and Path(ch_path).exists():
+        try:
+            with open(ch_path, "r", encoding="utf-8") as f:
+                if json.load(f).get("graph_sha256") == digest:
+                    return False
+        except ValueError:
+            pass
+    with open(graph_path, "r", encoding="utf-8") as f:
+        graph = json.load(f)
+    ch = build_hierarchy(graph)
+    out = {"graph_sha256": digest, "nodes": ch["nodes"], "labels": search_spaces(ch["rank"], ch["up"])}
+    fileio.write_json(ch_path, out, compact=True)
+    load_hierarchy.cache_clear()
+    return True
+
+
+class Hierarchy:
+    """Loaded search spaces answering ZIP-to-ZIP distance queries."""
+
+    def __init__(self, ch):
+        self.nodes = ch["nodes"]
+        self.index = {z: i for i, z in enumerate(self.nodes)}
+        self.labels = [dict(space) for space in ch["labels"]]
+
+    def distance(self, zip1, zip2):
+        """Shortest graph distance in miles, or None if either ZIP is missing or unreachable."""
+        s, t = self.index.get(zip1), self.index.get(zip2)
+        if s is None or t is None:
+            return None
+        d = _meet(self.labels[s], self.labels[t])
+        return None if d == INF else round(d, 2)
+
+
+@lru_cache(maxsize=None)
+def load_hierarchy(ch_path=CH_FILE):
+    with open(ch_path, "r", encoding="utf-8") as f:
+        return Hierarchy(json.load(f))
+
+
+def road_distance(zip1, zip2):
+    """ZIP-to-ZIP distance over the graph, via the saved hierarchy."""
+    return load_hierarchy().distance(zip1, zip2)
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Build the contraction hierarchy for graph.json and/or query it.")
+    ap.add_argument("zips", nargs="*", help="Optional pickup and dropoff ZIPs to query")
+    ap.add_argument("--force", action="store_true", help="Rebuild even if graph.json is unchanged")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    rebuilt = ensure_hierarchy(force=args.force)
+    print(f"✅ hierarchy {'rebuilt' if rebuilt else 'up to date'} ({time.perf_counter() - t0:.2f}s): {CH_FILE}")
+    if len(args.zips) == 2:
+        ch = load_hierarchy()
+        t0 = time.perf_counter()
+        miles = ch.distance(*args.zips)
+        print(f"{args.zips[0]} → {args.zips[1]}: {miles} mi ({(time.perf_counter() - t0) * 1e6:.0f} µs)")
+
+
+if __name__ == "__main__":
+    main()
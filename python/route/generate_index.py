@@ -7,6 +7,7 @@
 
 from pathlib import Path
 from datetime import datetime
+from python.common.minify import publish
 
 ROUTE_DIR = Path("../../route/")
 INDEX_FILE = ROUTE_DIR / "index.html"
@@ -56,8 +57,10 @@ HEADER = """<!DOCTYPE html>
 
 def write_index():
     ROUTE_DIR.mkdir(parents=True, exist_ok=True)
-    INDEX_FILE.write_text(HEADER, encoding="utf-8")
-    print(f"✅ index.html written to: {INDEX_FILE.resolve()}")
+    if publish(INDEX_FILE, HEADER):
+        print(f"✅ index.html written to: {INDEX_FILE.resolve()}")
+    else:
+        print(f"✅ index.html unchanged: {INDEX_FILE.resolve()}")
 
 if __name__ == "__main__":
     write_index()
\ No newline at end of file
@@ -0,0 +1,140 @@
+# python/route/isochrone.py
+# ─────────────────────────────────────────────────────────────────────────────
+# Isochrones around the FOB: how long it takes to reach every ZIP, from one
+# single-source sweep, banded every BAND_MINUTES.
+#
+# The sweep is a single row of crow-flies distances (the prebuilt distance
+# matrix row when the matrix was built around this base with at least this
+# radius, else haversine over the shards) or, with --graph, one Dijkstra over
+# route/db/graph.json. Minutes are miles over AVG_SPEED, the same as
+# can_return_to_fob. Distances are symmetric, so a ZIP is reachable-and-
+# returnable within a budget when twice its minutes fit.
+#
+#   route/db/isochrone.json  {"base", "speed_mph", "band_minutes", "source",
+#                             "minutes": {zip: minutes},
+#                             "bands": [[upper minutes, [zips, nearest first]], ...]}
+#
+# Usage (from python/route/, repo root on PYTHONPATH):
+#   PYTHONPATH=../.. python isochrone.py                      # crow-flies
+#   PYTHONPATH=../.. python isochrone.py --graph --band 15
+# ─────────────────────────────────────────────────────────────────────────────
+
+import heapq
+import json
+import math
+from functools import lru_cache
+from pathlib import Path
+
+from python.common import fileio
+from python.geo import distance_matrix, logistics
+
+ISOCHRONE_FILE = Path("../../route/db/isochrone.json")
+GRAPH_FILE = Path("../../route/db/graph.json")
+BAND_MINUTES = 30
+
+
+def sweep_crow_flies(base=logistics.FOB_ZIP, max_miles=logistics.MAX_MILES):
+    """{zip: miles} from `base` to every ZIP within `max_miles`."""
+    matrix = distance_matrix.load_matrix()
+    # The matrix only covers ZIPs within its radius of its own FOB; a row for
+    # any other base, or a smaller radius, would silently drop ZIPs.
+    if matrix is not None and matrix.fob == base and (matrix.radius or 0) >= max_miles:
+        return {z: d for z in matrix.zips if (d := matrix.miles(base, z)) <= max_miles}
+    zips, lats, lons = distance_matrix.service_area(logistics.DB_DIR, base, max_miles)
+    b = zips.index(base)
+    return {z: round(logistics.haversine(lats[b], lons[b], lat, lon), 2) for z, lat, lon in zip(zips, lats, lons)}
+
+
+def sweep_graph(base=logistics.FOB_ZIP, max_miles=logistics.MAX_MILES, graph_path=GRAPH_FILE):
+    """{zip: miles} by Dijkstra over the hop graph, stopping at `max_miles`."""
+    with open(graph_path, "r", encoding="utf-8") as f:
+        graph = json.load(f)
+    dist = {base: 0.0}
+    done = {}
+    heap = [(0.0, base)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if u in done or d > max_miles:
+            continue
+        done[u] = round(d, 2)
+        for v, w in graph.get(u, {}).items():
+            nd = d + w
+            if nd < dist.get(v, float("inf")):
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return done
+
+
+def bands(minutes, band_minutes=BAND_MINUTES):
+    """[[upper bound, [zips nearest first]], ...] for every non-empty band."""
+    out = {}
+    for z, m in sorted(minutes.items(), key=lambda kv: (kv[1], kv[0])):
+        upper = max(1, math.ceil(m / band_minutes)) * band_minutes
+        out.setdefault(upper, []).append(z)
+    return [[upper, zips] for upper, zips in sorted(out.items())]
+
+
+def build(base=logistics.FOB_ZIP, speed=logistics.AVG_SPEED, band_minutes=BAND_MINUTES,
+          max_hours=logistics.MAX_HOURS, use_graph=False):
+    """Sweep once from `base` and write the JSON export. Returns the table."""
+    max_miles = speed * max_hours
+    miles = sweep_graph(base, max_miles) if use_graph else sweep_crow_flies(base, max_miles)
+    minutes = {z: round(m / speed * 60, 1) for z, m in miles.items()}
+    table = {
+        "base": base,
+        "speed_mph": speed,
+        "band_minutes": band_minutes,
+        "source": "graph" if use_graph else "crow-flies",
+        "minutes": dict(sorted(minutes.items())),
+        "bands": bands(minutes, band_minutes),
+    }
+    fileio.write_json(ISOCHRONE_FILE, table, compact=True)
+    load_isochrone.cache_clear()
+    return table
+
+
+@lru_cache(maxsize=None)
+def load_isochrone(path=ISOCHRONE_FILE):
+    """The built table, or None if it hasn't been built."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def minutes_from_base(zipcode):
+    table = load_isochrone()
+    return table["minutes"].get(zipcode) if table else None
+
+
+def can_return(zipcode, time_left_hr):
+    """One-lookup can_return_to_fob for the built base: True/False, or None when
+    the ZIP isn't in the table (callers fall back to logistics)."""
+    m = minutes_from_base(zipcode)
+    return None if m is None else m <= time_left_hr * 60
+
+
+def round_trip_feasible(zipcode, budget_hr):
+    """Out from the base and back again within `budget_hr`."""
+    m = minutes_from_base(zipcode)
+    return None if m is None else 2 * m <= budget_hr * 60
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Sweep once from the FOB and export banded isochrones.")
+    ap.add_argument("--base", default=logistics.FOB_ZIP, help=f"Base ZIP (default: {logistics.FOB_ZIP})")
+    ap.add_argument("--band", type=int, default=BAND_MINUTES, help=f"Band width in minutes (default: {BAND_MINUTES})")
+    ap.add_argument("--hours", type=float, default=logistics.MAX_HOURS, help=f"Time budget (default: {logistics.MAX_HOURS})")
+    ap.add_argument("--graph", action="store_true", help="Sweep the hop graph instead of crow-flies distance")
+    args = ap.parse_args()
+
+    table = build(args.base, band_minutes=args.band, max_hours=args.hours, use_graph=args.graph)
+    for upper, zips in table["bands"]:
+        print(f"  ≤{upper:>4} min  {len(zips):>5} ZIPs")
+    print(f"✅ {len(table['minutes'])} ZIPs from {args.base} written to {ISOCHRONE_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import json
 from pathlib import Path
 from python.geo.logistics import haversine, FOB_ZIP, DB_DIR
+from python.common import fileio
 
 RADIUS = 100  # miles
 STATE_PREFIX = FOB_ZIP[:2]
@@ -24,10 +25,7 @@ def main():
             }
 
     # Save as JS object
-    with open(OUTPUT_FILE, "w") as out:
-        out.write("const zipCoords = ")
-        json.dump(flat, out, indent=2)
-        out.write(";\n")
+    fileio.write_text(OUTPUT_FILE, "const zipCoords = " + json.dumps(flat, indent=2) + ";\n")
 
     print(f"✅ Wrote {len(flat)} ZIPs to {OUTPUT_FILE}")
 
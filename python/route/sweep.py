@@ -0,0 +1,167 @@
+# python/route/sweep.py
+# ─────────────────────────────────────────────────────────────────────────────
+# What-if sweeps over the cost-model constants in logistics.py.
+#
+# An offer log is replayed under every combination of MPG, FUEL_RATE,
+# AVG_SPEED, LOAD_MULTIPLIER and MIN_MARGIN_PER_GIG. go_or_no takes an offer
+# when
+#
+#     payout > cost(p→d) + cost(d→FOB) - cost(p→FOB)
+#            = load x (fuel/mpg x M + margin x H(speed))
+#
+# where M and H are the signed sums of leg miles and whole leg hours. Miles
+# are fixed per offer and H only depends on speed. So settings are grouped by
+# (speed, load x margin); within a group the only thing that varies is the
+# per-mile cost a = load x fuel/mpg, and each offer is taken exactly when a is
+# on the right side of its own break-even ratio. Sorting those ratios once per
+# group and running np.searchsorted over every a (with prefix sums for the
+# gains) prices all settings in O((offers + settings) log offers) instead of
+# settings x offers. Costs skip estimate_cost's per-leg rounding to the cent,
+# so thresholds can differ from it by up to 1.5¢.
+#
+# For each setting: take rate, total net gain over the offers taken, and the
+# mean break-even payout (the right-hand side above).
+#
+# Usage (from python/route/, repo root on PYTHONPATH):
+#   PYTHONPATH=../.. python sweep.py --fuel-rate 2.5:4.5:0.05 --mpg 12:30:1 --min-margin 0:10:0.5
+#   PYTHONPATH=../.. python sweep.py ../../route/db/offer_log.json --out sweep.csv --top 20
+# ─────────────────────────────────────────────────────────────────────────────
+
+import csv
+import itertools
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from python.geo import logistics
+from python.route.assign import coords, haversine
+
+OFFER_LOG = Path("../../route/db/offer_log.json")
+PARAMS = {
+    "mpg": logistics.MPG,
+    "fuel_rate": logistics.FUEL_RATE,
+    "avg_speed": logistics.AVG_SPEED,
+    "load_multiplier": logistics.LOAD_MULTIPLIER,
+    "min_margin": logistics.MIN_MARGIN_PER_GIG,
+}
+
+
+def leg_miles(offers):
+    """(loaded, home_after, home_from_pickup) miles per offer."""
+    p_lat, p_lon = coords([str(o["pickup"]) for o in offers])
+    q_lat, q_lon = coords([str(o["dropoff"]) for o in offers])
+    f_lat, f_lon = coords([logistics.FOB_ZIP])
+    return (haversine(p_lat, p_lon, q_lat, q_lon),
+            haversine(q_lat, q_lon, f_lat, f_lon),
+            haversine(p_lat, p_lon, f_lat, f_lon))
+
+
+def settings_grid(grid):
+    """{param: [values]} (missing params = current constants) → {param: 1-D array}
+    with one entry per combination."""
+    values = [np.atleast_1d(np.asarray(grid.get(name, [default]), dtype=float)) for name, default in PARAMS.items()]
+    mesh = np.meshgrid(*values, indexing="ij")
+    return {name: m.ravel() for name, m in zip(PARAMS, mesh)}
+
+
+def _taken_sums(r, cols, a, side):
+    """For offers sorted by critical ratio r, the count and column sums of the
+    offers taken at each per-mile cost in `a`: r > a ("above") or r < a ("below")."""
+    order = np.argsort(r, kind="stable")
+    r = r[order]
+    # cum[k] = sums over the first k offers in ratio order
+    cum = np.vstack([np.zeros(cols.shape[1]), np.cumsum(cols[order], axis=0)])
+    if side == "above":
+        k = np.searchsorted(r, a, side="right")
+        return cum[-1] - cum[k]
+    k = np.searchsorted(r, a, side="left")
+    return cum[k]
+
+
+def sweep(offers, grid):
+    """Evaluate every setting in `grid` against `offers`. Returns {param arrays...,
+    "take_rate", "net_gain", "break_even"} with one entry per setting."""
+    settings = settings_grid(grid)
+    n_settings = len(settings["mpg"])
+    n_offers = len(offers)
+    payout = np.array([float(o["payout"]) for o in offers])
+    loaded, home_after, home_now = (leg_miles(offers) if offers else (np.zeros(0),) * 3)
+    signed_miles = loaded + home_after - home_now
+    accepted_miles = loaded + home_after
+
+    a = settings["load_multiplier"] * settings["fuel_rate"] / settings["mpg"]    # $ per signed mile
+    b = settings["load_multiplier"] * settings["min_margin"]                     # $ per signed hour
+    take_rate = np.zeros(n_settings)
+    net_gain = np.zeros(n_settings)
+    break_even = np.zeros(n_settings)
+    if not n_offers:
+        return {**settings, "take_rate": take_rate, "net_gain": net_gain, "break_even": break_even}
+
+    pos, neg, zero = signed_miles > 0, signed_miles < 0, signed_miles == 0
+    keys, group = np.unique(np.stack([settings["avg_speed"], b], axis=1), axis=0, return_inverse=True)
+    group = group.ravel()
+    for g, (speed, per_hour) in enumerate(keys):
+        sel = np.nonzero(group == g)[0]
+        accepted_hours = np.ceil(loaded / speed) + np.ceil(home_after / speed)
+        signed_hours = accepted_hours - np.ceil(home_now / speed)
+        # Taken iff payout - per_hour x H > a x M, i.e. a < ratio (M > 0) or a > ratio (M < 0).
+        slack = payout - per_hour * signed_hours
+        cols = np.stack([np.ones(n_offers), payout, accepted_miles, accepted_hours], axis=1)
+        sums = np.zeros((len(sel), 4))
+        if pos.any():
+            sums += _taken_sums(slack[pos] / signed_miles[pos], cols[pos], a[sel], "above")
+        if neg.any():
+            sums += _taken_sums(slack[neg] / signed_miles[neg], cols[neg], a[sel], "below")
+        if zero.any():
+            sums += cols[zero & (slack > 0)].sum(axis=0)
+        take_rate[sel] = sums[:, 0] / n_offers
+        net_gain[sel] = sums[:, 1] - a[sel] * sums[:, 2] - per_hour * sums[:, 3]
+        break_even[sel] = a[sel] * signed_miles.mean() + per_hour * signed_hours.mean()
+
+    return {**settings, "take_rate": take_rate, "net_gain": net_gain, "break_even": break_even}
+
+
+def _values(spec):
+    """"3.19" → [3.19]; "2.5:4.5:0.05" → inclusive range; "15,20,25" → list."""
+    if ":" in spec:
+        start, stop, step = (float(x) for x in spec.split(":"))
+        return list(np.round(np.arange(start, stop + step / 2, step), 6))
+    return [float(x) for x in spec.split(",")]
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Replay an offer log across a grid of cost-model constants.")
+    ap.add_argument("log", nargs="?", default=str(OFFER_LOG), help=f"JSON list of offers (default: {OFFER_LOG})")
+    for name, default in PARAMS.items():
+        ap.add_argument(f"--{name.replace('_', '-')}", default=str(default),
+                        help=f"value, a,b,c or start:stop:step (default: {default})")
+    ap.add_argument("--out", help="Write every setting to this CSV")
+    ap.add_argument("--top", type=int, default=10, help="Settings to print, best net gain first (default: 10)")
+    args = ap.parse_args()
+
+    with open(args.log, "r", encoding="utf-8") as f:
+        offers = json.load(f)
+    grid = {name: _values(getattr(args, name)) for name in PARAMS}
+
+    t0 = time.perf_counter()
+    result = sweep(offers, grid)
+    seconds = time.perf_counter() - t0
+    n = len(result["mpg"])
+
+    columns = list(PARAMS) + ["take_rate", "net_gain", "break_even"]
+    if args.out:
+        with open(args.out, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(columns)
+            w.writerows(zip(*(np.round(result[c], 4).tolist() for c in columns)))
+    print(f"{'  '.join(f'{c:>15}' for c in columns)}")
+    for i in itertools.islice(np.argsort(-result["net_gain"]), args.top):
+        print("  ".join(f"{result[c][i]:>15.4g}" for c in columns))
+    print(f"\n✅ {n:,} settings x {len(offers):,} offers = {n * len(offers):,} evaluations in {seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
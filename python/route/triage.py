@@ -0,0 +1,131 @@
+# python/route/triage.py
+# ─────────────────────────────────────────────────────────────────────────────
+# Offer-board triage: price many offers through zone lookups and only pay for
+# exact ZIP-level costing when the zone estimate can't call it.
+#
+# Each leg is looked up in the zone-to-zone matrices from python.geo.zones.
+# Because every ZIP in a zone sits within that zone's radius of its centroid,
+# the true leg is within radius[a] + radius[b] miles of the centroid distance,
+# and since cost only grows with miles that bounds the cost too. go_or_no's
+# verdict is TAKE exactly when
+#
+#     payout - cost(pickup→dropoff) - cost(dropoff→FOB) + cost(pickup→FOB) > 0
+#
+# so if that margin is positive (or not) across the whole bound, the zone
+# verdict is the exact verdict. Offers whose bound straddles zero, or that
+# touch a ZIP outside the zones, fall back to go_or_no.
+#
+# Usage (from python/route/, repo root on PYTHONPATH):
+#   PYTHONPATH=../.. python triage.py               # route/db/offers.json
+#   PYTHONPATH=../.. python triage.py board.json
+# ─────────────────────────────────────────────────────────────────────────────
+
+import json
+import time
+from pathlib import Path
+
+from python.geo.logistics import FOB_ZIP, cost_for_miles
+from python.geo.zones import load_zones
+from python.route.evaluate import go_or_no
+
+OFFERS_FILE = Path("../../route/db/offers.json")
+QUANTUM_MI = 0.05     # lookup_distance serves service-area legs to the nearest 0.1 mi
+GUARD = 0.01          # dollars; margins this close to zero always go exact
+
+
+def _leg(table, za, zb):
+    """(estimate, low, high) cost of a leg between zones za and zb."""
+    zones = table["zones"]
+    miles = table["miles"][za][zb]
+    slack = zones[za]["radius_mi"] + zones[zb]["radius_mi"] + QUANTUM_MI
+    return table["cost"][za][zb], cost_for_miles(max(0.0, miles - slack)), cost_for_miles(miles + slack)
+
+
+def zone_estimate(table, pickup, dropoff, payout):
+    """Zone-priced go_or_no result with "net_gain_bounds", or None if any ZIP
+    is outside the zones."""
+    zz = table["zip_zone"]
+    zp, zd, zf = zz.get(pickup), zz.get(dropoff), zz.get(FOB_ZIP)
+    if zp is None or zd is None or zf is None:
+        return None
+    pd_est, pd_lo, pd_hi = _leg(table, zp, zd)
+    df_est, df_lo, df_hi = _leg(table, zd, zf)
+    pf_est, pf_lo, pf_hi = _leg(table, zp, zf)
+
+    cost_if_accepted = pd_est + df_est
+    net_gain = payout - cost_if_accepted
+    margin = (payout - pd_lo - df_lo + pf_hi, payout - pd_hi - df_hi + pf_lo)
+    return {
+        "pickup": pickup,
+        "dropoff": dropoff,
+        "payout": payout,
+        "cost_if_accepted": round(cost_if_accepted, 2),
+        "net_gain": round(net_gain, 2),
+        "net_gain_bounds": [round(payout - pd_hi - df_hi, 2), round(payout - pd_lo - df_lo, 2)],
+        "cost_to_just_go_home": round(pf_est, 2),
+        "margin_bounds": [round(min(margin), 2), round(max(margin), 2)],
+        "verdict": "✅ TAKE IT" if net_gain > -pf_est else "❌ SKIP IT",
+    }
+
+
+def triage(offers, table=None):
+    """Verdicts for [{"pickup", "dropoff", "payout"}, ...] plus a report of how
+    many were settled by zones, how many went exact, and how wide the bounds were."""
+    table = table if table is not None else load_zones()
+    results = []
+    widths = []
+    exact = 0
+    for offer in offers:
+        pickup, dropoff, payout = str(offer["pickup"]), str(offer["dropoff"]), float(offer["payout"])
+        est = zone_estimate(table, pickup, dropoff, payout) if table else None
+        if est is not None:
+            lo, hi = est["margin_bounds"]
+            if lo > GUARD or hi < -GUARD:
+                # The whole bound is on one side of the threshold: the zone verdict stands.
+                est["verdict"] = "✅ TAKE IT" if lo > GUARD else "❌ SKIP IT"
+                est["mode"] = "zone"
+                widths.append(est["net_gain_bounds"][1] - est["net_gain_bounds"][0])
+                results.append(est)
+                continue
+        result = go_or_no(pickup, dropoff, payout)
+        result["mode"] = "exact"
+        results.append(result)
+        exact += 1
+
+    report = {
+        "offers": len(results),
+        "zone": len(results) - exact,
+        "exact": exact,
+        "max_net_gain_bound_width": round(max(widths), 2) if widths else 0.0,
+        "mean_net_gain_bound_width": round(sum(widths) / len(widths), 2) if widths else 0.0,
+    }
+    return results, report
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Triage an offer board with zone costs, going exact only near the threshold.")
+    ap.add_argument("offers", nargs="?", default=str(OFFERS_FILE), help=f"JSON list of offers (default: {OFFERS_FILE})")
+    args = ap.parse_args()
+
+    with open(args.offers, "r", encoding="utf-8") as f:
+        offers = json.load(f)
+    if load_zones() is None:
+        print("⚠️ zones.json not built (python/geo/zones.py); every offer goes exact.")
+
+    t0 = time.perf_counter()
+    results, report = triage(offers)
+    ms = (time.perf_counter() - t0) * 1000
+
+    for r in results:
+        bounds = r.get("net_gain_bounds")
+        spread = f" [{bounds[0]:.2f}, {bounds[1]:.2f}]" if bounds else ""
+        print(f"  {r['pickup']} → {r['dropoff']}  ${r['payout']:.2f}  net ${r['net_gain']:.2f}{spread}  "
+              f"{r['mode']:<5} {r['verdict']}")
+    print(f"\n🧭 {report['offers']} offers in {ms:.1f} ms: {report['zone']} by zone, {report['exact']} exact; "
+          f"net gain bound width max ${report['max_net_gain_bound_width']:.2f}, "
+          f"mean ${report['mean_net_gain_bound_width']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,9 @@
 # Use this script offline while on the road.
 # ─────────────────────────────────────────────────────────────────────────────
 
-import json
 from pathlib import Path
 from datetime import datetime
+from python.common import fileio
 
 OUTPUT_FILE = Path("../../route/db/inputs.json")
 
@@ -38,7 +38,7 @@ def main():
         "timestamp": datetime.now().isoformat(timespec="seconds")
     }
 
-    OUTPUT_FILE.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    fileio.write_json(OUTPUT_FILE, data)
     print(f"\n✅ Saved route to {OUTPUT_FILE.resolve()}")
     print("Run `evaluate.py` to assess viability.")
 